@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
 from helpers.config import get_config
 
 from stores.llm import LLMProviderFactory
@@ -8,6 +9,13 @@ from stores.llm.templates.template_parser import TemplateParser
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from utils.metrics import start_worker_metrics_server, mark_worker_process_dead
+
+import asyncio
+import os
+import logging
+
+logger = logging.getLogger(__name__)
 
 settings = get_config()
 
@@ -15,7 +23,12 @@ async def get_setup_utils():
     settings = get_config()
 
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
-    db_engine = create_async_engine(postgres_conn)
+    db_engine = create_async_engine(
+        postgres_conn,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
     db_client = sessionmaker(
         db_engine, class_=AsyncSession, expire_on_commit=False
     )
@@ -53,6 +66,108 @@ async def get_setup_utils():
             vision_client)
 
 
+# --- Worker-lifetime resources ---
+# Each prefork child builds the engine/pool, SDK clients and vector DB
+# connection once (worker_process_init) and runs every task on one persistent
+# event loop, so pooled asyncpg connections stay bound to a live loop. Outside
+# a prefork child (eager mode, scripts, solo/threads pools) tasks fall back to
+# a fresh loop and fresh resources per call, disposed at the end of the task.
+_worker_pid = None
+_worker_loop = None
+_worker_resources = None
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """Expose the ingestion metrics from the worker's main process."""
+    port = get_config().CELERY_METRICS_PORT
+    if not port:
+        return
+    try:
+        start_worker_metrics_server(port)
+        logger.info(f"Worker metrics served on port {port}")
+    except Exception as e:
+        logger.error(f"Worker metrics server failed to start: {str(e)}")
+
+
+@worker_process_init.connect
+def init_worker_resources(**kwargs):
+    global _worker_pid, _worker_loop, _worker_resources
+
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _worker_pid = os.getpid()
+
+    try:
+        _worker_resources = _worker_loop.run_until_complete(get_setup_utils())
+        logger.info(f"Worker resources initialized | pid: {_worker_pid}")
+    except Exception as e:
+        # Tasks retry the setup lazily on first use.
+        _worker_resources = None
+        logger.error(f"Worker resources initialization failed: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_resources(**kwargs):
+    global _worker_loop, _worker_resources
+
+    mark_worker_process_dead(os.getpid())
+
+    if _worker_loop is None or _worker_loop.is_closed():
+        return
+
+    resources, _worker_resources = _worker_resources, None
+    try:
+        if resources is not None:
+            db_engine, vectordb_client = resources[0], resources[6]
+            _worker_loop.run_until_complete(vectordb_client.disconnect())
+            _worker_loop.run_until_complete(db_engine.dispose())
+    except Exception as e:
+        logger.error(f"Worker resources shutdown failed: {str(e)}")
+    finally:
+        _worker_loop.close()
+        _worker_loop = None
+
+
+def _in_worker_process() -> bool:
+    return _worker_loop is not None and _worker_pid == os.getpid()
+
+
+def run_in_worker_loop(coro):
+    """Run a task coroutine on the worker's persistent loop (asyncio.run elsewhere)."""
+    if _in_worker_process():
+        return _worker_loop.run_until_complete(coro)
+    return asyncio.run(coro)
+
+
+async def get_worker_setup_utils():
+    """
+    Same tuple as get_setup_utils(), shared for the worker's lifetime when
+    running inside an initialized worker process. Pair with
+    release_setup_utils() in the task's finally block.
+    """
+    global _worker_resources
+
+    if not _in_worker_process():
+        return await get_setup_utils()
+
+    if _worker_resources is None:
+        _worker_resources = await get_setup_utils()
+    return _worker_resources
+
+
+async def release_setup_utils(db_engine, vectordb_client):
+    """Dispose per-task resources; worker-lifetime ones are left open."""
+    if _worker_resources is not None and db_engine is _worker_resources[0]:
+        return
+
+    if db_engine:
+        await db_engine.dispose()
+
+    if vectordb_client:
+        await vectordb_client.disconnect()
+
+
 
 # Create Celery application instance
 celery_app = Celery(
@@ -103,9 +218,12 @@ celery_app.conf.update(
 
     task_routes={
         "tasks.file_processing.process_project_files": {"queue": "file_processing"},
+        "tasks.file_processing.process_project_file": {"queue": "file_processing"},
         "tasks.data_indexing.index_data_content": {"queue": "data_indexing"},
         "tasks.process_workflow.process_and_push_workflow": {"queue": "process_workflow"},
+        "tasks.process_workflow.collect_project_files_results": {"queue": "process_workflow"},
         "tasks.maintenance.clean_celery_executions_table": {"queue": "default"},
+        "tasks.maintenance.evict_embedding_cache": {"queue": "default"},
     },
 
     beat_schedule={
@@ -113,6 +231,11 @@ celery_app.conf.update(
             'task': "tasks.maintenance.clean_celery_executions_table",
             'schedule': 86400,  # every 24 hours
             'args': ()
+        },
+        'evict-embedding-cache': {
+            'task': "tasks.maintenance.evict_embedding_cache",
+            'schedule': 86400,  # every 24 hours
+            'args': ()
         }
     },
 
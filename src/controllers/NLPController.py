@@ -1,21 +1,36 @@
 from .BaseController import basecontroller
 from models.db_schemes import Project, DataChunk
 from stores.llm.LLMEnums import DocumentTypeEnum
+from stores.llm.SemanticAnswerCache import AnswerCacheSlot
 from typing import List, Optional, Union
 import os
 import json
+import asyncio
 import logging
+from utils.metrics import RETRIEVAL_CACHE_LOOKUPS, ANSWER_CACHE_LOOKUPS, ANSWER_CACHE_SAVED_TOKENS
 
 class NLPController(basecontroller):
 
     def __init__(self, vectordb_client, generation_client, template_parser,
-                 embedding_client):
+                 embedding_client, embedding_cache=None, query_embedding_cache=None,
+                 retrieval_cache=None, answer_cache=None):
         super().__init__()
 
         self.vectordb_client = vectordb_client
         self.generation_client = generation_client
         self.template_parser = template_parser
         self.embedding_client = embedding_client
+        # Optional EmbeddingCacheModel; when set, document embeddings are
+        # looked up by text hash before calling the provider.
+        self.embedding_cache = embedding_cache
+        # Optional QueryEmbeddingCache shared by the requests of a process.
+        self.query_embedding_cache = query_embedding_cache
+        # Optional RetrievalCache (Redis) of search results, keyed by the
+        # collection's index version; see bump_index_version.
+        self.retrieval_cache = retrieval_cache
+        # Optional SemanticAnswerCache; used for projects that opted in and
+        # only alongside the retrieval cache, which owns the index versions.
+        self.answer_cache = answer_cache
         self.logger = logging.getLogger(__name__)
 
 
@@ -101,7 +116,17 @@ class NLPController(basecontroller):
     
     async def reset_vector_db_collection(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.id)
-        return await self.vectordb_client.delete_collection(collection_name=collection_name)
+        result = await self.vectordb_client.delete_collection(collection_name=collection_name)
+        await self.bump_index_version(project=project)
+        return result
+
+    async def bump_index_version(self, project: Project):
+        """Invalidate cached search results of the project's collection (after any vector change)."""
+        if self.retrieval_cache is None:
+            return
+        await self.retrieval_cache.bump_index_version(
+            collection_name=self.create_collection_name(project_id=project.id)
+        )
     
     async def get_vector_db_collection_info(self, project: Project):
         collection_name = self.create_collection_name(project_id=project.id)
@@ -111,9 +136,106 @@ class NLPController(basecontroller):
             return collection_info
         return collection_info.model_dump() if hasattr(collection_info, 'model_dump') else collection_info.dict()
     
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed ``texts`` as documents, serving byte-identical texts from the
+        embedding cache when one is attached and only sending the rest (each
+        distinct text once) to the provider.
+        """
+        if self.embedding_cache is None:
+            return await self._embed_document_batches(texts)
+
+        document_type = DocumentTypeEnum.DOCUMENT.value
+        cache_key = {
+            "embedding_backend": self.config.EMBEDDING_BACKEND,
+            "embedding_model_id": getattr(self.embedding_client, "embedding_model_id", None)
+                                  or self.config.EMBEDDING_MODEL_ID,
+            "embedding_size": self.config.EMBEDDING_MODEL_SIZE,
+            "document_type": document_type,
+        }
+        text_hashes = [self.embedding_cache.hash_text(t) for t in texts]
+
+        try:
+            vectors_by_hash = await self.embedding_cache.get_cached_vectors(
+                **cache_key, text_hashes=text_hashes
+            )
+        except Exception as e:
+            self.logger.warning(f"Embedding cache lookup failed: {e}")
+            vectors_by_hash = {}
+
+        missing = {}
+        for text_hash, text in zip(text_hashes, texts):
+            if text_hash not in vectors_by_hash:
+                missing.setdefault(text_hash, text)
+
+        hits = sum(1 for text_hash in text_hashes if text_hash in vectors_by_hash)
+        self.logger.info(f"Embedding cache: {hits}/{len(texts)} hits, "
+                         f"{len(missing)} distinct texts to embed")
+
+        if missing:
+            new_vectors = await self._embed_document_batches(list(missing.values()))
+            new_by_hash = dict(zip(missing.keys(), new_vectors))
+            try:
+                await self.embedding_cache.insert_vectors(
+                    **cache_key, vectors_by_hash=new_by_hash
+                )
+            except Exception as e:
+                self.logger.warning(f"Embedding cache insert failed: {e}")
+            vectors_by_hash.update(new_by_hash)
+
+        return [vectors_by_hash[text_hash] for text_hash in text_hashes]
+
+    async def _embed_document_batches(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed ``texts`` as documents through the async provider API.
+
+        Texts are split into ``EMBEDDING_BATCH_SIZE`` batches (Cohere accepts
+        at most 96 texts per call) and up to ``EMBEDDING_MAX_CONCURRENCY``
+        batches are in flight at once. Vectors are reassembled in input
+        order. A failed batch is retried on its own, with backoff, up to
+        ``EMBEDDING_MAX_RETRIES`` times; only when a batch exhausts its
+        retries does the whole call fail, since the alignment of texts and
+        vectors would otherwise be compromised.
+        """
+        batch_size = self.config.EMBEDDING_BATCH_SIZE
+        semaphore = asyncio.Semaphore(max(1, self.config.EMBEDDING_MAX_CONCURRENCY))
+        batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        async def _embed_batch(batch_no: int, batch_texts: List[str]):
+            for attempt in range(self.config.EMBEDDING_MAX_RETRIES + 1):
+                async with semaphore:
+                    try:
+                        batch_vectors = await self.embedding_client.embed_text_async(
+                            text=batch_texts,
+                            document_type=DocumentTypeEnum.DOCUMENT.value
+                        )
+                    except Exception as e:
+                        self.logger.warning(f"Embedding batch {batch_no} failed "
+                                            f"(attempt {attempt + 1}): {e}")
+                        batch_vectors = None
+
+                if batch_vectors and len(batch_vectors) == len(batch_texts):
+                    return batch_vectors
+
+                if attempt < self.config.EMBEDDING_MAX_RETRIES:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+
+            error_msg = (f"Batch starting at index {batch_no * batch_size} failed. "
+                         f"Data alignment compromised.")
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        results = await asyncio.gather(*[
+            _embed_batch(batch_no, batch_texts)
+            for batch_no, batch_texts in enumerate(batches)
+        ])
+
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
     async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: Optional[List[Union[str, int]]]= None, 
-                                   do_reset: bool = False):
+                                   do_reset: bool = False, create_index: bool = True,
+                                   replace_existing: bool = False):
         
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.id)
@@ -121,28 +243,8 @@ class NLPController(basecontroller):
         # step2: manage items
         texts = [ self.generation_client.process_text(c.chunk_text) for c in chunks ]
         metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = []
-        BATCH_SIZE = 96 # Cohere allows a maximum of 96 texts per API call
-
-        for i in range(0, len(texts), BATCH_SIZE):
-            batch_texts = texts[i : i + BATCH_SIZE]
-
-            if not batch_texts:
-                continue
-
-            # This returns a List[List[float]]
-            batch_vectors = self.embedding_client.embed_text(
-                text=batch_texts, 
-                document_type=DocumentTypeEnum.DOCUMENT.value
-            )
+        vectors = await self.embed_documents(texts)
 
-            if batch_vectors:
-                vectors.extend(batch_vectors)
-            else:
-                error_msg = f"Batch starting at index {i} failed. Data alignment compromised."
-                self.logger.error(error_msg)
-                raise ValueError(error_msg) 
-            
         if len(vectors) != len(texts):
              raise ValueError(f"Mismatch! Texts: {len(texts)}, Vectors: {len(vectors)}")
 
@@ -153,13 +255,23 @@ class NLPController(basecontroller):
             do_reset=do_reset,
         )
 
-        # step4: insert into vector db
+        # step4: drop any vectors already stored for these chunks, so a
+        # re-run after an interrupted index (or a pre-existing collection)
+        # does not leave duplicate rows
+        if replace_existing and chunks_ids:
+            _ = await self.vectordb_client.delete_by_record_ids(
+                collection_name=collection_name,
+                record_ids=chunks_ids,
+            )
+
+        # step5: insert into vector db
         inserttion_success = await self.vectordb_client.insert_many(
             collection_name=collection_name,
             texts=texts,
             metadata=metadata,
             vectors=vectors,
             record_ids= chunks_ids,
+            create_index=create_index,
             )
         
         if not inserttion_success:
@@ -167,42 +279,239 @@ class NLPController(basecontroller):
         
         return True
 
-    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10, score_threshold: Optional[float] = None):
+    async def build_vector_index(self, project: Project) -> bool:
+        """Build the project's vector index after a deferred-index bulk load."""
+        collection_name = self.create_collection_name(project_id=project.id)
+        return await self.vectordb_client.create_vector_index(collection_name=collection_name)
+
+    def resolve_search_effort(self, project: Project, search_effort: Optional[int] = None) -> Optional[int]:
+        """Request value, else the project's default, else the app-wide default."""
+        if search_effort is not None:
+            return search_effort
+        project_search_effort = getattr(project, "project_search_effort", None)
+        if project_search_effort is not None:
+            return project_search_effort
+        return self.config.VECTOR_DB_SEARCH_EFFORT
+
+    async def embed_query(self, processed_text: str) -> Optional[List[float]]:
+        """Embed a processed query text, through the query embedding cache when attached."""
+        document_type = DocumentTypeEnum.QUERY.value
+        cache_key = None
+
+        if self.query_embedding_cache is not None:
+            cache_key = self.query_embedding_cache.make_key(
+                text=processed_text,
+                backend=self.config.EMBEDDING_BACKEND,
+                model_id=getattr(self.embedding_client, "embedding_model_id", None)
+                         or self.config.EMBEDDING_MODEL_ID,
+                embedding_size=self.config.EMBEDDING_MODEL_SIZE,
+                document_type=document_type,
+            )
+            query_vector = await self.query_embedding_cache.get(cache_key)
+            if query_vector is not None:
+                return query_vector
+
+        vectors = await self.embedding_client.embed_text_async(text=processed_text,
+                                                               document_type=document_type)
+
+        if not vectors or len(vectors) == 0 or not vectors[0]:
+            return None
+
+        query_vector = vectors[0]
+        if cache_key is not None:
+            await self.query_embedding_cache.set(cache_key, query_vector)
+        return query_vector
+
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10, score_threshold: Optional[float] = None,
+                                          search_effort: Optional[int] = None):
         query_vector = None
 
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.id)
 
-        # step2: get text embedding vector
         processed_text = self.generation_client.process_text(text)
-        vectors = self.embedding_client.embed_text(text=processed_text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
-
-        if not vectors or len(vectors) == 0:
-            return False
-        
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        search_effort = self.resolve_search_effort(project=project, search_effort=search_effort)
+
+        # step2: serve unchanged collections from the retrieval cache
+        cache_key = None
+        if self.retrieval_cache is not None:
+            index_version = await self.retrieval_cache.get_index_version(collection_name)
+            if index_version is not None:
+                cache_key = self.retrieval_cache.make_key(
+                    collection_name=collection_name,
+                    index_version=index_version,
+                    query_text=processed_text,
+                    embedding_model_id=getattr(self.embedding_client, "embedding_model_id", None),
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    search_effort=search_effort,
+                )
+                cached_results = await self.retrieval_cache.get(cache_key)
+                RETRIEVAL_CACHE_LOOKUPS.labels(result="hit" if cached_results else "miss").inc()
+                if cached_results:
+                    return cached_results
+
+        # step3: get text embedding vector
+        query_vector = await self.embed_query(processed_text)
 
         if not query_vector:
             return False    
 
-        # step3: do semantic search
+        # step4: do semantic search
         results = await self.vectordb_client.search_by_vector(
             collection_name=collection_name,
             vector=query_vector,
             limit=limit,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            search_effort=search_effort,
         )
 
         if not results:
             return False
 
+        if cache_key is not None:
+            await self.retrieval_cache.set(cache_key, results)
+
         return results
     
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10, score_threshold: Optional[float] = None, primary_lang: Optional[str] = None):
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10, score_threshold: Optional[float] = None, primary_lang: Optional[str] = None,
+                                  search_effort: Optional[int] = None):
+        """
+        Returns ``(answer, full_prompt, chat_history)``. Answers served from
+        the semantic answer cache come back with ``full_prompt`` and
+        ``chat_history`` set to None, since nothing was generated.
+        """
         
-        answer, full_prompt, chat_history = None, None, None
+        answer = None
+
+        # step0: near-duplicate questions are answered from the cache
+        cached_answer, cache_slot = await self.get_cached_answer(
+            project=project,
+            query=query,
+            limit=limit,
+            score_threshold=score_threshold,
+            primary_lang=primary_lang,
+            search_effort=search_effort,
+        )
+        if cached_answer:
+            return cached_answer["answer"], None, None
+
+        # step1-3: retrieve related documents and build the prompts
+        retrieved_documents, full_prompt, chat_history = await self.prepare_rag_prompt(
+            project=project,
+            query=query,
+            limit=limit,
+            score_threshold=score_threshold,
+            primary_lang=primary_lang,
+            search_effort=search_effort,
+        )
+
+        if not retrieved_documents:
+            return answer, full_prompt, chat_history
+
+        # step4: Retrieve the Answer
+        answer = await self.generation_client.generate_text_async(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        await self.store_cached_answer(
+            cache_slot=cache_slot,
+            query=query,
+            answer=answer,
+            sources=self.build_source_labels(retrieved_documents),
+            full_prompt=full_prompt,
+            chat_history=chat_history,
+        )
+
+        return answer, full_prompt, chat_history
+
+    async def get_cached_answer(self, project: Project, query: str, limit: int = 10, score_threshold: Optional[float] = None, primary_lang: Optional[str] = None,
+                                search_effort: Optional[int] = None):
+        """
+        Look ``query`` up in the semantic answer cache. Returns
+        ``(cached_answer, cache_slot)``: the cached entry on a hit (its
+        ``answer`` and ``sources`` are ready to return), and the slot to
+        pass to ``store_cached_answer`` after generating on a miss. Both are
+        None when the cache does not apply to this project.
+        """
+        if (self.answer_cache is None or self.retrieval_cache is None
+                or not getattr(project, "project_answer_cache_enabled", False)):
+            return None, None
+
+        if primary_lang:
+            self.template_parser.set_language(primary_lang)
+
+        collection_name = self.create_collection_name(project_id=project.id)
+        index_version = await self.retrieval_cache.get_index_version(collection_name)
+        if index_version is None:
+            return None, None
+
+        query_vector = await self.embed_query(self.generation_client.process_text(query))
+        if not query_vector:
+            return None, None
+
+        cache_slot = AnswerCacheSlot(
+            partition=self.answer_cache.make_partition(
+                collection_name=collection_name,
+                index_version=index_version,
+                generation_model_id=getattr(self.generation_client, "generation_model_id", None),
+                language=self.template_parser.language,
+                limit=limit,
+                score_threshold=score_threshold,
+                search_effort=self.resolve_search_effort(project=project, search_effort=search_effort),
+            ),
+            query_vector=query_vector,
+        )
+
+        cached_answer = await self.answer_cache.lookup(cache_slot)
+        ANSWER_CACHE_LOOKUPS.labels(result="hit" if cached_answer else "miss").inc()
+        if cached_answer:
+            ANSWER_CACHE_SAVED_TOKENS.labels(kind="prompt").inc(cached_answer.get("prompt_tokens", 0))
+            ANSWER_CACHE_SAVED_TOKENS.labels(kind="completion").inc(cached_answer.get("completion_tokens", 0))
+            self.logger.info(f"Answer cache hit (similarity {cached_answer.get('similarity')}) "
+                             f"for project {project.id}")
+
+        return cached_answer, cache_slot
+
+    async def store_cached_answer(self, cache_slot: Optional[AnswerCacheSlot], query: str, answer: str,
+                                  sources: List[dict], full_prompt: str, chat_history: list):
+        """Remember a freshly generated answer (no-op without a slot from ``get_cached_answer``)."""
+        if cache_slot is None or not answer:
+            return
+
+        prompt_text = "\n".join([str(message) for message in chat_history or []] + [full_prompt or ""])
+        await self.answer_cache.store(
+            cache_slot,
+            query=query,
+            answer=answer,
+            sources=sources,
+            prompt_tokens=self.answer_cache.estimate_tokens(prompt_text),
+            completion_tokens=self.answer_cache.estimate_tokens(answer),
+        )
+
+    def stream_rag_answer(self, full_prompt: str, chat_history: list):
+        """Async iterator over the answer's text deltas (see ``prepare_rag_prompt``)."""
+        return self.generation_client.generate_text_stream(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+    def build_source_labels(self, retrieved_documents) -> List[dict]:
+        """Citation labels of the retrieved documents, numbered as in the prompt."""
+        return [
+            {"doc_num": idx + 1, "source": self._build_source_label(doc.metadata)}
+            for idx, doc in enumerate(retrieved_documents)
+        ]
+
+    async def prepare_rag_prompt(self, project: Project, query: str, limit: int = 10, score_threshold: Optional[float] = None, primary_lang: Optional[str] = None,
+                                 search_effort: Optional[int] = None):
+        """
+        Retrieve the documents for ``query`` and build the generation
+        prompts. Returns ``(retrieved_documents, full_prompt, chat_history)``;
+        all None when nothing was retrieved.
+        """
+        retrieved_documents, full_prompt, chat_history = None, None, None
 
         # Set the template language if provided by the user
         if primary_lang:
@@ -213,11 +522,12 @@ class NLPController(basecontroller):
             project=project,
             text=query,
             limit=limit,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            search_effort=search_effort,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return None, full_prompt, chat_history
         
         # step2: Construct LLM prompt
         system_prompt = self.template_parser.get("rag", "system_prompt")
@@ -245,11 +555,5 @@ class NLPController(basecontroller):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
-
-        return answer, full_prompt, chat_history
+        return retrieved_documents, full_prompt, chat_history
     
\ No newline at end of file
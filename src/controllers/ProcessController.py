@@ -1,10 +1,18 @@
 import os
 import io
+import codecs
 import re
+import hashlib
 import unicodedata
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable, Iterator
 from .BaseController import basecontroller
+from helpers.config import get_config
 from .ProjectController import projectController
+from utils.ingestion_profiler import IngestionProfiler
 from models import processingenum
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
@@ -28,6 +36,11 @@ class processcontroller(basecontroller):
     _STRUCTURED_COL_SEP = " | "
     # Maximum number of rows grouped into a single Document before chunking.
     _STRUCTURED_ROWS_PER_DOC = 50
+    # Rows serialized per vectorized pass (a multiple of _STRUCTURED_ROWS_PER_DOC);
+    # bounds the temporary per-column string arrays for very large frames.
+    _STRUCTURED_SERIALIZE_BLOCK = 10_000
+    # Prefix read to pick the encoding of a streamed CSV.
+    _CSV_ENCODING_SAMPLE_BYTES = 1024 * 1024
 
     # ---------------------- PDF multimodal tuning ----------------------
     # Hard upper bound on rows per serialized table batch. Batches are also
@@ -52,6 +65,13 @@ class processcontroller(basecontroller):
     _SCANNED_IMAGE_COVERAGE = 0.50
     # DPI used when rasterizing a full page for OCR.
     _PAGE_SCAN_DPI = 150
+    # Smallest page range handed to one parallel parsing worker; shorter
+    # PDFs are walked sequentially (pool start-up would dominate).
+    _PDF_MIN_PAGES_PER_SHARD = 20
+
+    # Bump whenever parsing/chunking output changes for the same input, so
+    # incremental re-processing treats every asset as changed.
+    PARSER_VERSION = "2"
 
     # Vision prompts.
     _IMAGE_PROMPT = (
@@ -65,13 +85,16 @@ class processcontroller(basecontroller):
     )
 
 
-    def __init__(self, project_id: str, vision_client=None):
+    def __init__(self, project_id: str, vision_client=None, profiler: IngestionProfiler = None):
         super().__init__()
         self.project_id = project_id
         self.project_path = projectController().get_project_path(project_id=project_id)
         # Optional multimodal vision client. May be None or a NullVisionProvider;
         # PDF text/table processing must work regardless of its availability.
         self.vision_client = vision_client
+        # Per-stage timings / element counts of the file being processed.
+        # Stages only record inside ``self.profiler.file(...)``.
+        self.profiler = profiler or IngestionProfiler()
         # Per-parse cache: the last real (non-generic) column set observed
         # while walking pages of the CURRENT PDF, keyed by table index. Lets a
         # multi-page table continue to carry its original column names on the
@@ -79,12 +102,32 @@ class processcontroller(basecontroller):
         # Reset on every call to ``load_pdf_file`` so it never leaks across
         # files handled by the same controller instance.
         self._last_pdf_columns: dict[int, list[str]] | None = None
+        # Raw first-table captures recorded by a parallel parsing shard
+        # (see ``_parse_pdf_page_range``); None outside of shard parsing.
+        self._pdf_carry_probes: dict[int, dict] | None = None
 
 
 
     def get_file_path(self, file_id: str) -> str:
         return os.path.join(self.project_path, file_id)
     
+    def get_file_fingerprint(self, file_id: str, chunk_size: int, overlap_size: int) -> str | None:
+        """
+        Content fingerprint of a file as it would be chunked: SHA-256 of the
+        file bytes plus chunk settings and ``PARSER_VERSION``. None if the
+        file is missing.
+        """
+        file_path = self.get_file_path(file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(f"|{chunk_size}|{overlap_size}|{self.PARSER_VERSION}".encode("utf-8"))
+        return digest.hexdigest()
+
     def get_file_extension(self, file_id: str) -> str:
         return os.path.splitext(file_id)[1].lower()
 
@@ -108,6 +151,10 @@ class processcontroller(basecontroller):
           5. Order every element with a recursive XY-cut layout algorithm.
           6. Emit LangChain Documents with rich, citation-ready metadata.
 
+        Pages are walked in order, or — for long PDFs when ``PDF_PARSE_WORKERS``
+        is above 1 — sharded across a process pool and merged back in page
+        order (see ``_load_pdf_pages_parallel``).
+
         Vision is strictly optional: if no provider is configured, image /
         page-scan enrichment is skipped and text/table processing still works.
         Any unexpected fatal error degrades gracefully to the legacy loader so
@@ -124,29 +171,34 @@ class processcontroller(basecontroller):
         self._last_pdf_columns = {}
 
         try:
-            doc = fitz.open(file_path)
+            with self.profiler.stage("pdf_open"):
+                doc = fitz.open(file_path)
 
         except Exception as e:  # unreadable PDF is a genuine fatal condition
             logger.error(f"Failed to open PDF {file_path}: {e}")
             raise
 
         vision_ready = self._vision_ready()
-        documents: list[Document] = []
 
         try:
-            for page_index in range(doc.page_count):
-                try:
-                    page = doc.load_page(page_index)
-                    page_elements = self._process_pdf_page(
-                        page, page_index, file_path, vision_ready
-                    )
-                    documents.extend(page_elements)
-                except Exception as page_err:  # never let one page kill the file
-                    logger.error(f"Error processing page {page_index} of "
-                                 f"{file_path}: {page_err}")
-                    continue
+            page_count = doc.page_count
+            self.profiler.count("pages", page_count)
+            workers = self._pdf_parse_workers(page_count)
+            if workers > 1:
+                # The pool opens its own handles; release ours before forking.
+                doc.close()
+                doc = None
+                documents = self._load_pdf_pages_parallel(
+                    file_path, page_count, workers, vision_ready
+                )
+            else:
+                shard = self._parse_pdf_page_range(
+                    doc, 0, page_count, file_path, vision_ready
+                )
+                documents = [d for _, page_docs in shard["pages"] for d in page_docs]
         finally:
-            doc.close()
+            if doc is not None:
+                doc.close()
 
         # Fallback: if the rich parser produced nothing (e.g. exotic PDF),
         # fall back to the legacy loader so we never silently drop content.
@@ -157,9 +209,194 @@ class processcontroller(basecontroller):
 
         return documents
 
+    def _parse_pdf_page_range(self, doc, start: int, end: int, file_path: str,
+                              vision_ready: bool,
+                              record_carry_probes: bool = False) -> dict:
+        """
+        Walk pages ``[start, end)`` of an open ``fitz`` document in order.
+
+        Returns ``{"pages": [(page_index, docs), ...], "carry_probes": {...},
+        "last_columns": {...}}``. ``carry_probes`` is only filled when
+        ``record_carry_probes`` is set (parallel shards): it captures the raw
+        first table of every page parsed before this range saw a real header
+        of its own, i.e. the pages whose output may depend on a column
+        carry-over from a previous shard.
+        """
+        self._pdf_carry_probes = {} if record_carry_probes else None
+        pages: list[tuple[int, list[Document]]] = []
+
+        # Vision calls for the whole range are dispatched concurrently while
+        # later pages are still being parsed; pages are finalized afterwards
+        # in page order, so reading order is unaffected.
+        with self._vision_dispatcher(vision_ready) as dispatch:
+            drafts: list[dict] = []
+            for page_index in range(start, end):
+                try:
+                    page = doc.load_page(page_index)
+                    draft = self._collect_pdf_page(page, page_index, vision_ready)
+                    for job in draft["vision_jobs"]:
+                        dispatch(job)
+                    drafts.append(draft)
+                except Exception as page_err:  # never let one page kill the file
+                    logger.error(f"Error processing page {page_index} of "
+                                 f"{file_path}: {page_err}")
+                    continue
+
+            for draft in drafts:
+                try:
+                    pages.append((draft["page_index"],
+                                  self._finalize_pdf_page(draft, file_path)))
+                except Exception as page_err:
+                    logger.error(f"Error processing page {draft['page_index']} "
+                                 f"of {file_path}: {page_err}")
+                    continue
+
+        cache_stats = getattr(self.vision_client, "stats", None)
+        if vision_ready and callable(cache_stats):
+            logger.info(f"Vision cache stats after {file_path} pages {start + 1}-{end}: "
+                        f"{cache_stats()}")
+
+        carry_probes = self._pdf_carry_probes or {}
+        self._pdf_carry_probes = None
+        return {
+            "pages": pages,
+            "carry_probes": carry_probes,
+            "last_columns": dict(self._last_pdf_columns or {}),
+        }
+
+    # ------------------------------------------------------------------
+    # Parallel page parsing (process pool, page-range shards)
+    # ------------------------------------------------------------------
+    def _pdf_parse_workers(self, page_count: int) -> int:
+        """Number of pool workers to use for a PDF (1 == sequential walk)."""
+        try:
+            workers = int(getattr(self.config, "PDF_PARSE_WORKERS", 1) or 1)
+        except (TypeError, ValueError):
+            workers = 1
+        if workers <= 1 or page_count < 2 * self._PDF_MIN_PAGES_PER_SHARD:
+            return 1
+        return min(workers, page_count // self._PDF_MIN_PAGES_PER_SHARD)
+
+    def _load_pdf_pages_parallel(self, file_path: str, page_count: int,
+                                 workers: int, vision_ready: bool) -> list[Document]:
+        """
+        Shard ``[0, page_count)`` into contiguous page ranges, parse each
+        shard in its own process (each opening its own ``fitz`` handle) and
+        merge the per-page Documents back in page order.
+
+        Multi-page table carry-over is resolved after the merge: a shard
+        cannot know the columns the previous shard ended with, so it reports
+        the raw first table of every page parsed before it saw a real header
+        (``carry_probes``). Walking the shards in order we know the exact
+        ``_last_pdf_columns`` state the sequential walk would have had at
+        each such page; when applying it changes the table serialization,
+        that single page is re-parsed here with the carried columns seeded.
+        """
+        shard_size = -(-page_count // workers)
+        shard_args = [
+            (self.project_id, file_path, start,
+             min(start + shard_size, page_count), vision_ready)
+            for start in range(0, page_count, shard_size)
+        ]
+
+        try:
+            from billiard import Pool  # allows children of Celery pool processes
+        except ImportError:
+            from multiprocessing import Pool
+
+        pool = None
+        try:
+            pool = Pool(processes=len(shard_args))
+            shards = pool.map(_parse_pdf_shard, shard_args)
+            pool.close()
+            for shard in shards:
+                self.profiler.merge(shard.get("profile"))
+        except Exception as e:
+            logger.warning(f"Parallel PDF parsing failed for {file_path} ({e}); "
+                           f"falling back to a sequential walk")
+            if pool is not None:
+                pool.terminate()
+            import fitz
+            self._last_pdf_columns = {}
+            doc = fitz.open(file_path)
+            try:
+                shard = self._parse_pdf_page_range(
+                    doc, 0, page_count, file_path, vision_ready
+                )
+            finally:
+                doc.close()
+            return [d for _, page_docs in shard["pages"] for d in page_docs]
+        finally:
+            if pool is not None:
+                pool.join()
+
+        pages = self._resolve_pdf_shard_carryover(shards, file_path, vision_ready)
+        logger.info(f"PDF parsed in parallel: {file_path} — {page_count} pages, "
+                    f"{len(shard_args)} shards")
+        return [d for _, page_docs in pages for d in page_docs]
+
+    def _resolve_pdf_shard_carryover(self, shards: list[dict], file_path: str,
+                                     vision_ready: bool) -> list[tuple[int, list[Document]]]:
+        """Replay the sequential column carry-over across shard boundaries."""
+        pages: list[tuple[int, list[Document]]] = []
+        carried: dict[int, list[str]] = {}
+        doc = None
+
+        try:
+            for shard in shards:
+                probes = shard["carry_probes"]
+                carry_columns = carried.get(1)
+                for page_index, page_docs in shard["pages"]:
+                    probe = probes.get(page_index)
+                    if (probe is not None and carry_columns
+                            and self._carry_changes_table(probe, page_index,
+                                                          carry_columns)):
+                        if doc is None:
+                            import fitz
+                            doc = fitz.open(file_path)
+                        self._last_pdf_columns = {1: list(carry_columns)}
+                        try:
+                            page_docs = self._process_pdf_page(
+                                doc.load_page(page_index), page_index,
+                                file_path, vision_ready
+                            )
+                        except Exception as page_err:
+                            logger.error(f"Error re-processing page {page_index} "
+                                         f"of {file_path}: {page_err}")
+                    pages.append((page_index, page_docs))
+                carried.update(shard["last_columns"])
+        finally:
+            if doc is not None:
+                doc.close()
+
+        self._last_pdf_columns = carried
+        return pages
+
+    def _carry_changes_table(self, probe: dict, page_index: int,
+                             carry_columns: list[str]) -> bool:
+        """True when seeding ``carry_columns`` alters a page's first table."""
+        table = _CapturedPdfTable(probe["rows"], probe["header_names"])
+        without = self._serialize_table(table, page_index, 1)
+        with_carry = self._serialize_table(table, page_index, 1,
+                                           carry_columns=carry_columns)
+        return without != with_carry
+
     def _process_pdf_page(self, page, page_index: int, file_path: str,
                           vision_ready: bool) -> list[Document]:
         """Build the ordered list of Documents for a single PDF page."""
+        with self._vision_dispatcher(vision_ready) as dispatch:
+            draft = self._collect_pdf_page(page, page_index, vision_ready)
+            for job in draft["vision_jobs"]:
+                dispatch(job)
+        return self._finalize_pdf_page(draft, file_path)
+
+    def _collect_pdf_page(self, page, page_index: int, vision_ready: bool) -> dict:
+        """
+        Parse one page into a draft: table/text elements plus the vision
+        jobs (a full-page scan or per-image descriptions) still to be run.
+        The draft holds no ``fitz`` objects beyond the page rect, so the page
+        can be released while its vision jobs are in flight.
+        """
         page_rect = page.rect
         page_width = float(page_rect.width) or 1.0
         page_height = float(page_rect.height) or 1.0
@@ -170,11 +407,13 @@ class processcontroller(basecontroller):
         # --- 1. Tables first -------------------------------------------------
         table_index = 0
         try:
-            table_finder = page.find_tables()
+            with self.profiler.stage("find_tables"):
+                table_finder = page.find_tables()
             tables = getattr(table_finder, "tables", []) or []
         except Exception as e:
             logger.debug(f"find_tables failed on page {page_index}: {e}")
             tables = []
+        self.profiler.count("tables", len(tables))
 
         for table in tables:
             bbox = self._normalize_bbox(getattr(table, "bbox", None), page_rect)
@@ -193,6 +432,10 @@ class processcontroller(basecontroller):
             if (table_index == 1 and self._last_pdf_columns
                     and self._last_pdf_columns.get(1)):
                 carry_columns = self._last_pdf_columns[1]
+            elif table_index == 1 and self._pdf_carry_probes is not None:
+                # Parallel shard without a header of its own yet: the
+                # previous shard may have carried columns into this table.
+                self._pdf_carry_probes[page_index] = _CapturedPdfTable.probe(table)
 
             serialized = self._serialize_table(
                 table, page_index, table_index, carry_columns=carry_columns
@@ -220,7 +463,8 @@ class processcontroller(basecontroller):
         # --- 2. Text blocks (skip those inside tables) -----------------------
         text_char_count = 0
         try:
-            page_dict = page.get_text("dict")
+            with self.profiler.stage("text_extraction"):
+                page_dict = page.get_text("dict")
         except Exception as e:
             logger.debug(f"get_text(dict) failed on page {page_index}: {e}")
             page_dict = {"blocks": []}
@@ -240,6 +484,7 @@ class processcontroller(basecontroller):
                    for tb in table_bboxes):
                 continue
             text_char_count += len(cleaned)
+            self.profiler.count("text_blocks")
             elements.append({
                 "content_type": "text",
                 "bbox": bbox,
@@ -247,28 +492,60 @@ class processcontroller(basecontroller):
             })
 
         # --- 3. Collect candidate images ------------------------------------
-        images = self._extract_page_images(page, page_index, page_rect) if vision_ready else []
+        images = []
+        if vision_ready:
+            with self.profiler.stage("image_extraction"):
+                images = self._extract_page_images(page, page_index, page_rect)
+            self.profiler.count("images", len(images))
 
         # --- 4. Scanned-page detection --------------------------------------
         is_scanned = self._is_scanned_page(
             text_char_count, table_bboxes, images, page_width, page_height
         )
 
+        vision_jobs: list[dict] = []
         if vision_ready and is_scanned:
-            scan_element = self._run_page_scan(page, page_index, page_rect)
-            if scan_element is not None:
-                # A scanned page is atomic: the OCR result is the only element.
-                return self._elements_to_documents(
-                    [scan_element], page_index, file_path, page_rect
-                )
-            # If OCR yielded nothing, fall through to whatever text we have.
+            scan_job = self._prepare_page_scan(page, page_index, page_rect)
+            if scan_job is not None:
+                vision_jobs.append(scan_job)
+            # If OCR yields nothing, the page falls back to whatever text we have.
 
-        # --- 5. Per-image vision enrichment ---------------------------------
+        # --- 5. Per-image vision jobs ---------------------------------------
         if vision_ready and not is_scanned:
-            self._enrich_with_images(images, page_index, elements)
+            vision_jobs.extend(self._prepare_image_jobs(images, page_index))
+
+        return {
+            "page_index": page_index,
+            "page_rect": page_rect,
+            "elements": elements,
+            "vision_jobs": vision_jobs,
+        }
+
+    def _finalize_pdf_page(self, draft: dict, file_path: str) -> list[Document]:
+        """Splice finished vision results into a draft, then order + convert."""
+        page_index = draft["page_index"]
+        page_rect = draft["page_rect"]
+        elements = draft["elements"]
+
+        image_elements: list[dict] = []
+        for job in draft["vision_jobs"]:
+            result = job["future"].result() if job.get("future") else None
+            if job["kind"] == "page":
+                scan_element = self._build_page_scan_element(result, page_index,
+                                                             page_rect)
+                if scan_element is not None:
+                    # A scanned page is atomic: the OCR result is the only element.
+                    return self._elements_to_documents(
+                        [scan_element], page_index, file_path, page_rect
+                    )
+            else:
+                image_element = self._build_image_element(result, job, page_index)
+                if image_element is not None:
+                    image_elements.append(image_element)
 
         # --- 6. Order + convert ---------------------------------------------
-        return self._elements_to_documents(elements, page_index, file_path, page_rect)
+        return self._elements_to_documents(elements + image_elements, page_index,
+                                           file_path, page_rect)
 
     # ------------------------------------------------------------------
     # Vision availability
@@ -692,40 +969,105 @@ class processcontroller(basecontroller):
         logger.debug("Image still exceeds VISION_MAX_IMAGE_BYTES; skipping")
         return None
 
-    def _enrich_with_images(self, images: list[dict], page_index: int,
-                            elements: list[dict]) -> None:
-        """Call the vision provider per image and append image elements."""
+    def _prepare_image_jobs(self, images: list[dict], page_index: int) -> list[dict]:
+        """Optimize candidate images into ``describe_image`` vision jobs."""
+        jobs: list[dict] = []
         image_index = 0
         for image in images:
             image_index += 1
-            optimized = self._optimize_image(image["bytes"])
+            with self.profiler.stage("image_optimization"):
+                optimized = self._optimize_image(image["bytes"])
             if optimized is None:
                 continue
             payload, mime = optimized
-            try:
-                result = self.vision_client.describe_image(
+            jobs.append({
+                "kind": "image",
+                "page_index": page_index,
+                "image_index": image_index,
+                "bbox": image["bbox"],
+                "payload": payload,
+                "mime": mime,
+            })
+        return jobs
+
+    def _build_image_element(self, result, job: dict, page_index: int) -> dict | None:
+        if result is None or not result.text:
+            return None
+        body = (f"[Image Description | Page: {page_index + 1} | "
+                f"Image: {job['image_index']}]\n{result.text.strip()}")
+        return {
+            "content_type": "image",
+            "bbox": job["bbox"],
+            "text": body,
+            "image_index": job["image_index"],
+            "vision_provider": result.provider,
+            "vision_model": result.model,
+        }
+
+    # ------------------------------------------------------------------
+    # Concurrent vision dispatch
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _vision_dispatcher(self, vision_ready: bool):
+        """
+        Yield a ``dispatch(job)`` callable that runs vision jobs on a thread
+        pool capped at ``VISION_MAX_CONCURRENCY`` in-flight requests.
+
+        ``dispatch`` attaches a future to the job. It blocks once the backlog
+        reaches twice the in-flight cap, so page parsing can run ahead of the
+        provider without buffering an entire document of image payloads.
+        Leaving the context waits for every dispatched job.
+        """
+        if not vision_ready:
+            yield lambda job: None
+            return
+
+        try:
+            max_in_flight = max(1, int(self.config.VISION_MAX_CONCURRENCY))
+        except (TypeError, ValueError, AttributeError):
+            max_in_flight = 1
+        backlog = threading.BoundedSemaphore(max_in_flight * 2)
+
+        def _dispatch(job: dict) -> None:
+            backlog.acquire()
+            future = executor.submit(self._call_vision, job)
+            future.add_done_callback(lambda _f: backlog.release())
+            job["future"] = future
+
+        with ThreadPoolExecutor(max_workers=max_in_flight,
+                                thread_name_prefix="vision") as executor:
+            yield _dispatch
+
+    def _call_vision(self, job: dict):
+        """Run one vision job; failures are logged and yield None."""
+        # Drop the payload as soon as the request is made so finished jobs
+        # don't pin image bytes until their page is finalized.
+        payload = job.pop("payload", None)
+        page_index = job["page_index"]
+        self.profiler.count("vision_calls")
+        self.profiler.count("vision_bytes", len(payload or b""))
+        try:
+            with self.profiler.stage("vision"):
+                if job["kind"] == "page":
+                    return self.vision_client.describe_page(
+                        image_bytes=payload,
+                        mime_type=job["mime"],
+                        prompt=self._PAGE_PROMPT,
+                        metadata={"page": page_index},
+                    )
+                return self.vision_client.describe_image(
                     image_bytes=payload,
-                    mime_type=mime,
+                    mime_type=job["mime"],
                     prompt=self._IMAGE_PROMPT,
-                    metadata={"page": page_index, "image_index": image_index},
+                    metadata={"page": page_index, "image_index": job["image_index"]},
                 )
-            except Exception as e:  # image-level failure must not kill the page
+        except Exception as e:  # one failed call must not kill the page
+            if job["kind"] == "page":
+                logger.warning(f"Vision describe_page failed (page {page_index}): {e}")
+            else:
                 logger.warning(f"Vision describe_image failed "
-                               f"(page {page_index}, image {image_index}): {e}")
-                continue
-            if result is None or not result.text:
-                continue
-
-            body = (f"[Image Description | Page: {page_index + 1} | "
-                    f"Image: {image_index}]\n{result.text.strip()}")
-            elements.append({
-                "content_type": "image",
-                "bbox": image["bbox"],
-                "text": body,
-                "image_index": image_index,
-                "vision_provider": result.provider,
-                "vision_model": result.model,
-            })
+                               f"(page {page_index}, image {job['image_index']}): {e}")
+            return None
 
     # ------------------------------------------------------------------
     # Full-page scan detection + OCR
@@ -743,8 +1085,8 @@ class processcontroller(basecontroller):
         largest = max((self._bbox_area(im["bbox"]) for im in images), default=0.0)
         return (largest / page_area) >= self._SCANNED_IMAGE_COVERAGE
 
-    def _run_page_scan(self, page, page_index: int, page_rect):
-        """Render the whole page once and OCR it via ``describe_page``."""
+    def _prepare_page_scan(self, page, page_index: int, page_rect) -> dict | None:
+        """Render the whole page once into a ``describe_page`` vision job."""
         try:
             import fitz
             matrix = fitz.Matrix(self._PAGE_SCAN_DPI / 72.0,
@@ -755,24 +1097,21 @@ class processcontroller(basecontroller):
             logger.warning(f"Failed to render page {page_index} for OCR: {e}")
             return None
 
-        optimized = self._optimize_image(png_bytes)
+        with self.profiler.stage("image_optimization"):
+            optimized = self._optimize_image(png_bytes)
         if optimized is None:
             return None
         payload, mime = optimized
+        return {
+            "kind": "page",
+            "page_index": page_index,
+            "payload": payload,
+            "mime": mime,
+        }
 
-        try:
-            result = self.vision_client.describe_page(
-                image_bytes=payload,
-                mime_type=mime,
-                prompt=self._PAGE_PROMPT,
-                metadata={"page": page_index},
-            )
-        except Exception as e:
-            logger.warning(f"Vision describe_page failed (page {page_index}): {e}")
-            return None
+    def _build_page_scan_element(self, result, page_index: int, page_rect) -> dict | None:
         if result is None or not result.text:
             return None
-
         body = (f"[Page Scan | Page: {page_index + 1}]\n"
                 f"{self._clean_text(result.text)}")
         return {
@@ -795,7 +1134,8 @@ class processcontroller(basecontroller):
         page_width = float(page_rect.width) or 1.0
         page_height = float(page_rect.height) or 1.0
 
-        ordered = self._xy_cut_order(elements, page_width, page_height, rtl)
+        with self.profiler.stage("xy_cut"):
+            ordered = self._xy_cut_order(elements, page_width, page_height, rtl)
 
         documents: list[Document] = []
         for order_index, element in enumerate(ordered):
@@ -938,8 +1278,15 @@ class processcontroller(basecontroller):
 
     def _dataframe_to_documents(self, df: pd.DataFrame, file_path: str,
                                 sheet_name: str = None) -> list[Document]:
+        """List form of :meth:`_iter_dataframe_documents`."""
+        return list(self._iter_dataframe_documents(df, file_path, sheet_name=sheet_name))
+
+    def _iter_dataframe_documents(self, df: pd.DataFrame, file_path: str,
+                                  sheet_name: str = None,
+                                  row_offset: int | None = None) -> Iterator[Document]:
         """
-        Convert a pandas DataFrame into a list of LangChain Documents.
+        Convert a pandas DataFrame into LangChain Documents, yielded one row
+        batch at a time.
 
         Strategy — **Row-with-Headers**:
         Each row is serialized as ``Header1: Value1 | Header2: Value2 | …``
@@ -947,11 +1294,15 @@ class processcontroller(basecontroller):
         Rows are batched into groups of ``_STRUCTURED_ROWS_PER_DOC`` to avoid
         creating an excessive number of micro-documents while still keeping
         each Document small enough for the downstream text splitter.
+
+        ``row_offset`` marks ``df`` as one slice of a longer stream: row
+        numbers and ``row_range`` continue after that many rows, and
+        ``total_rows`` is left out because the stream length is not known yet.
         """
         if df.empty:
             logger.warning(f"Empty DataFrame from {file_path}"
                            + (f" sheet={sheet_name}" if sheet_name else ""))
-            return []
+            return
 
         # Clean column names: strip whitespace, replace NaN headers
         df.columns = [
@@ -963,55 +1314,151 @@ class processcontroller(basecontroller):
         df = df.dropna(how="all").reset_index(drop=True)
 
         if df.empty:
-            return []
+            return
 
         headers = list(df.columns)
-        documents: list[Document] = []
+        block_rows: list[str] = []
+        block_start = 0
 
         for batch_start in range(0, len(df), self._STRUCTURED_ROWS_PER_DOC):
             batch_end = min(batch_start + self._STRUCTURED_ROWS_PER_DOC, len(df))
-            batch = df.iloc[batch_start:batch_end]
-
-            rows_text_parts: list[str] = []
-            for row_idx, (_, row) in enumerate(batch.iterrows(), start=batch_start + 1):
-                cells = [
-                    f"{h}: {str(v).strip()}" if pd.notna(v) else f"{h}: N/A"
-                    for h, v in zip(headers, row)
-                ]
-                rows_text_parts.append(
-                    f"Row {row_idx}:\n{self._STRUCTURED_COL_SEP.join(cells)}"
+
+            if batch_start >= block_start + len(block_rows):
+                block_start = batch_start
+                block_end = min(block_start + self._STRUCTURED_SERIALIZE_BLOCK, len(df))
+                block_rows = self._serialize_dataframe_rows(
+                    df.iloc[block_start:block_end], headers,
+                    first_row_number=(row_offset or 0) + block_start + 1,
                 )
 
+            rows_text_parts = block_rows[batch_start - block_start:batch_end - block_start]
+
             page_content = "\n\n".join(rows_text_parts)
 
             metadata = {
                 "source": file_path,
                 "format": "structured_data",
-                "row_range": f"{batch_start + 1}-{batch_end}",
-                "total_rows": len(df),
+                "row_range": f"{(row_offset or 0) + batch_start + 1}-{(row_offset or 0) + batch_end}",
                 "columns": headers,
             }
+            if row_offset is None:
+                metadata["total_rows"] = len(df)
             if sheet_name is not None:
                 metadata["sheet_name"] = sheet_name
 
-            documents.append(
-                Document(page_content=page_content, metadata=metadata)
+            yield Document(page_content=page_content, metadata=metadata)
+
+    def _serialize_dataframe_rows(self, df: pd.DataFrame, headers: list[str],
+                                  first_row_number: int = 1) -> list[str]:
+        """
+        Serialize every row of ``df`` as ``Row N:\nH1: V1 | H2: V2 | …``,
+        building the strings column by column instead of row by row.
+
+        Output is identical to iterating ``df.iterrows()`` and formatting each
+        cell with ``str(v).strip()`` (``N/A`` for missing values): cells are
+        read from ``df.to_numpy()``, the same common-dtype array ``iterrows``
+        builds its rows from, and boxed to Python objects per column exactly
+        as iterating a row Series would box them (so an int column in a
+        mixed int/float frame still renders as ``1.0``).
+        """
+        values = df.to_numpy()
+        rows = None
+
+        for col_idx, header in enumerate(headers):
+            column = pd.Series(values[:, col_idx]).astype(object)
+            cells = (f"{header}: " + column.map(str).str.strip()).mask(
+                column.isna(), f"{header}: N/A"
             )
+            rows = cells if rows is None else rows + self._STRUCTURED_COL_SEP + cells
 
-        return documents
+        row_numbers = pd.Series(range(first_row_number, first_row_number + len(df)))
+        rows = "Row " + row_numbers.astype(str) + ":\n" + rows
+        return rows.tolist()
 
     def load_csv_file(self, file_path: str) -> list[Document]:
         """
         Load a CSV file and convert it into LangChain Documents
         using the row-with-headers serialization strategy.
         """
+        return list(self.iter_csv_documents(file_path))
+
+    def iter_csv_documents(self, file_path: str) -> Iterator[Document]:
+        """
+        Streaming form of :meth:`load_csv_file`. Files of at least
+        ``CSV_STREAM_MIN_MB`` are read in row chunks (see
+        :meth:`_iter_csv_documents_chunked`); smaller ones in one go.
+        """
+        stream_min_bytes = self.config.CSV_STREAM_MIN_MB * 1024 * 1024
+        if os.path.getsize(file_path) >= stream_min_bytes:
+            yield from self._iter_csv_documents_chunked(file_path)
+            return
+
         try:
             df = pd.read_csv(file_path, encoding="utf-8", on_bad_lines="skip")
         except UnicodeDecodeError:
             df = pd.read_csv(file_path, encoding="latin-1", on_bad_lines="skip")
 
         logger.info(f"CSV loaded: {file_path} — {len(df)} rows, {len(df.columns)} columns")
-        return self._dataframe_to_documents(df, file_path)
+        yield from self._iter_dataframe_documents(df, file_path)
+
+    def _iter_csv_documents_chunked(self, file_path: str) -> Iterator[Document]:
+        """
+        Read a large CSV ``CSV_STREAM_CHUNK_ROWS`` rows at a time so memory
+        stays bounded by the chunk, not the file.
+
+        The encoding is detected once from a prefix sample; invalid UTF-8
+        bytes past the sample are replaced rather than re-reading the file.
+        Rows are handed on in whole ``_STRUCTURED_ROWS_PER_DOC`` batches so
+        Document boundaries and ``row_range`` numbering match a full read.
+        Column dtypes are inferred per chunk, and the streamed Documents
+        carry no ``total_rows``.
+        """
+        encoding = self._detect_csv_encoding(file_path)
+        rows_per_doc = self._STRUCTURED_ROWS_PER_DOC
+        chunk_rows = max(1, self.config.CSV_STREAM_CHUNK_ROWS // rows_per_doc) * rows_per_doc
+
+        rows_emitted = 0
+        pending = None
+
+        with pd.read_csv(file_path, encoding=encoding, encoding_errors="replace",
+                         on_bad_lines="skip", chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                chunk = chunk.dropna(how="all")
+                if pending is not None:
+                    chunk = pd.concat([pending, chunk])
+                    pending = None
+
+                # Rows skipped as bad lines or empty can leave a ragged tail;
+                # carry it into the next chunk to keep batches aligned.
+                aligned = len(chunk) - len(chunk) % rows_per_doc
+                if aligned < len(chunk):
+                    pending = chunk.iloc[aligned:]
+                    chunk = chunk.iloc[:aligned]
+                if chunk.empty:
+                    continue
+
+                yield from self._iter_dataframe_documents(chunk, file_path,
+                                                          row_offset=rows_emitted)
+                rows_emitted += len(chunk)
+
+        if pending is not None and not pending.empty:
+            yield from self._iter_dataframe_documents(pending, file_path,
+                                                      row_offset=rows_emitted)
+            rows_emitted += len(pending)
+
+        logger.info(f"CSV streamed: {file_path} — {rows_emitted} rows "
+                    f"({encoding}, {chunk_rows} rows per chunk)")
+
+    def _detect_csv_encoding(self, file_path: str) -> str:
+        """UTF-8 if the first ``_CSV_ENCODING_SAMPLE_BYTES`` decode as UTF-8, else latin-1."""
+        with open(file_path, "rb") as f:
+            sample = f.read(self._CSV_ENCODING_SAMPLE_BYTES)
+        try:
+            # Incremental so a multi-byte character cut by the sample end is fine.
+            codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        except UnicodeDecodeError:
+            return "latin-1"
+        return "utf-8"
 
     def load_excel_file(self, file_path: str) -> list[Document]:
         """
@@ -1019,24 +1466,231 @@ class processcontroller(basecontroller):
         into LangChain Documents using the row-with-headers strategy.
         Multiple sheets are handled individually with sheet-name metadata.
         """
+        documents = self.iter_excel_documents(file_path)
+        if documents is None:
+            return None
+
+        all_documents = list(documents)
+        return all_documents if all_documents else None
+
+    def iter_excel_documents(self, file_path: str) -> Iterator[Document] | None:
+        """
+        Streaming form of :meth:`load_excel_file`: one sheet is parsed and
+        serialized at a time. Returns None if the workbook cannot be opened.
+        """
+        if file_path.lower().endswith(processingenum.XLSX.value):
+            try:
+                import openpyxl
+                workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+                sheet_names = list(workbook.sheetnames)
+                workbook.close()
+            except Exception as e:
+                logger.error(f"Failed to open Excel file {file_path}: {e}")
+                return None
+            return self._iter_xlsx_documents(file_path, sheet_names)
+
         try:
             xls = pd.ExcelFile(file_path)
         except Exception as e:
             logger.error(f"Failed to open Excel file {file_path}: {e}")
             return None
 
-        all_documents: list[Document] = []
+        def _iter_sheets():
+            with xls:
+                for sheet_name in xls.sheet_names:
+                    df = xls.parse(sheet_name)
+                    logger.info(f"Excel sheet '{sheet_name}' loaded: "
+                                f"{len(df)} rows, {len(df.columns)} columns")
+                    yield from self._iter_dataframe_documents(
+                        df, file_path, sheet_name=sheet_name
+                    )
+                    del df
+
+        return _iter_sheets()
+
+    # ------------------------------------------------------------------
+    # Streaming .xlsx (read-only openpyxl, no DataFrames)
+    # ------------------------------------------------------------------
+    def _excel_parse_workers(self, sheet_count: int) -> int:
+        """Number of pool workers to use for a workbook (1 == in-process)."""
+        try:
+            workers = int(getattr(self.config, "EXCEL_PARSE_WORKERS", 1) or 1)
+        except (TypeError, ValueError):
+            workers = 1
+        return max(1, min(workers, sheet_count))
 
-        for sheet_name in xls.sheet_names:
-            df = xls.parse(sheet_name)
-            logger.info(f"Excel sheet '{sheet_name}' loaded: "
-                        f"{len(df)} rows, {len(df.columns)} columns")
-            sheet_docs = self._dataframe_to_documents(
-                df, file_path, sheet_name=sheet_name
+    def _iter_xlsx_documents(self, file_path: str, sheet_names: list[str]) -> Iterator[Document]:
+        """
+        Stream the sheets of an .xlsx workbook as row-batch Documents.
+
+        With one worker the sheets are walked in order from a single
+        read-only workbook, one row at a time. With ``EXCEL_PARSE_WORKERS``
+        > 1 each sheet is parsed in its own process (each opening its own
+        read-only handle) and the Documents are yielded in sheet order as
+        the sheets complete.
+        """
+        workers = self._excel_parse_workers(len(sheet_names))
+
+        if workers > 1:
+            try:
+                from billiard import Pool  # allows children of Celery pool processes
+            except ImportError:
+                from multiprocessing import Pool
+
+            sheet_args = [(self.project_id, file_path, name) for name in sheet_names]
+            pool = Pool(processes=workers)
+            try:
+                for sheet_docs in pool.imap(_parse_xlsx_sheet, sheet_args):
+                    yield from sheet_docs
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+            logger.info(f"Excel parsed in parallel: {file_path} — "
+                        f"{len(sheet_names)} sheets, {workers} workers")
+            return
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet_name in sheet_names:
+                yield from self._iter_xlsx_sheet_documents(
+                    workbook[sheet_name], file_path, sheet_name
+                )
+        finally:
+            workbook.close()
+
+    def _iter_xlsx_sheet_documents(self, worksheet, file_path: str,
+                                   sheet_name: str) -> Iterator[Document]:
+        """
+        Serialize one read-only worksheet with the Row-with-Headers strategy
+        of :meth:`_iter_dataframe_documents`, without building a DataFrame.
+
+        The first non-blank row is the header (``Unnamed: i`` for empty
+        header cells, ``name.1`` for duplicates, as pandas names them) and
+        blank rows are dropped. Cells are formatted as stored, with integral
+        floats shown as integers like pandas' openpyxl reader. ``row_range``
+        and ``sheet_name`` match the DataFrame path; ``total_rows`` is left
+        out because the sheet length is not known while streaming.
+        """
+        rows = worksheet.iter_rows(values_only=True)
+
+        headers = None
+        for raw_row in rows:
+            if not self._is_blank_xlsx_row(raw_row):
+                headers = self._xlsx_headers(raw_row)
+                break
+
+        if not headers:
+            logger.warning(f"Empty sheet from {file_path} sheet={sheet_name}")
+            return
+
+        rows_per_doc = self._STRUCTURED_ROWS_PER_DOC
+        rows_text_parts: list[str] = []
+        row_count = 0
+
+        for raw_row in rows:
+            if self._is_blank_xlsx_row(raw_row):
+                continue
+            row_count += 1
+            rows_text_parts.append(
+                f"Row {row_count}:\n{self._serialize_xlsx_row(raw_row, headers)}"
             )
-            all_documents.extend(sheet_docs)
+            if len(rows_text_parts) == rows_per_doc:
+                yield self._xlsx_rows_document(rows_text_parts, row_count, headers,
+                                               file_path, sheet_name)
+                rows_text_parts = []
+
+        if rows_text_parts:
+            yield self._xlsx_rows_document(rows_text_parts, row_count, headers,
+                                           file_path, sheet_name)
+
+        logger.info(f"Excel sheet '{sheet_name}' streamed: "
+                    f"{row_count} rows, {len(headers)} columns")
+
+    def _xlsx_rows_document(self, rows_text_parts: list[str], last_row: int,
+                            headers: list[str], file_path: str,
+                            sheet_name: str) -> Document:
+        first_row = last_row - len(rows_text_parts) + 1
+        return Document(
+            page_content="\n\n".join(rows_text_parts),
+            metadata={
+                "source": file_path,
+                "format": "structured_data",
+                "row_range": f"{first_row}-{last_row}",
+                "columns": headers,
+                "sheet_name": sheet_name,
+            },
+        )
 
-        return all_documents if all_documents else None
+    @staticmethod
+    def _xlsx_cell_value(value):
+        """None for empty cells; integral floats as int (pandas does the same)."""
+        if value is None or value == "":
+            return None
+        if isinstance(value, float):
+            if value != value:  # NaN
+                return None
+            if value.is_integer():
+                return int(value)
+        return value
+
+    @classmethod
+    def _is_blank_xlsx_row(cls, raw_row) -> bool:
+        return all(cls._xlsx_cell_value(v) is None for v in raw_row)
+
+    @classmethod
+    def _xlsx_headers(cls, raw_row) -> list[str]:
+        cells = [cls._xlsx_cell_value(v) for v in raw_row]
+        while cells and cells[-1] is None:
+            cells.pop()
+
+        headers: list[str] = []
+        seen: dict[str, int] = {}
+        for i, value in enumerate(cells):
+            name = f"Unnamed: {i}" if value is None else str(value)
+            dupes = seen.get(name, 0)
+            seen[name] = dupes + 1
+            if dupes:
+                name = f"{name}.{dupes}"
+            headers.append(name.strip())
+        return headers
+
+    def _serialize_xlsx_row(self, raw_row, headers: list[str]) -> str:
+        """
+        ``Header: value`` cells for every header column; values past the
+        header width are kept under ``Unnamed: i`` names instead of dropped.
+        """
+        values = [self._xlsx_cell_value(v) for v in raw_row]
+        width = len(headers)
+        while len(values) > width and values[-1] is None:
+            values.pop()
+        values.extend([None] * (width - len(values)))
+
+        cells = []
+        for i, value in enumerate(values):
+            header = headers[i] if i < width else f"Unnamed: {i}"
+            cells.append(f"{header}: N/A" if value is None else f"{header}: {str(value).strip()}")
+        return self._STRUCTURED_COL_SEP.join(cells)
+
+    def iter_file_content(self, file_id: str) -> Iterable[Document] | None:
+        """
+        Like :meth:`get_file_content`, but structured-data files (CSV / Excel)
+        yield their Documents lazily, row batch by row batch, instead of
+        materializing the whole file. Other formats are returned as loaded.
+        None if the file is missing, unsupported or unreadable.
+        """
+        file_path = self.get_file_path(file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        file_extension = self.get_file_extension(file_id)
+
+        if file_extension == processingenum.CSV.value:
+            return self.iter_csv_documents(file_path)
+        elif file_extension in (processingenum.XLSX.value, processingenum.XLS.value):
+            return self.iter_excel_documents(file_path)
+        return self.get_file_content(file_id)
 
     def get_file_content(self, file_id: str):
         file_path = self.get_file_path(file_id)
@@ -1103,6 +1757,22 @@ class processcontroller(basecontroller):
         if not file_content:
             return []
 
+        return list(self.iter_file_chunks(file_content, file_id,
+                                          chunk_size=chunk_size,
+                                          overlap_size=overlap_size))
+
+    def iter_file_chunks(self, file_content: Iterable[Document], file_id: str,
+                         chunk_size: int=1000, overlap_size: int=200) -> Iterator[Document]:
+        """
+        Streaming form of :meth:`get_file_chunks` over any iterable of
+        Documents.
+
+        Documents of non-PDF files are split and yielded as they arrive (the
+        splitter never joins separate Documents, so the output is identical
+        to splitting the full list). PDFs are routed as a whole because their
+        per-page grouping needs every element of a page; they come out of the
+        page parser as a list anyway.
+        """
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=overlap_size,
@@ -1110,23 +1780,30 @@ class processcontroller(basecontroller):
             is_separator_regex=False,
         )
 
+        if self.get_file_extension(file_id) != processingenum.PDF.value:
+            for doc in file_content:
+                with self.profiler.stage("chunking"):
+                    chunks = text_splitter.create_documents([doc.page_content],
+                                                            metadatas=[doc.metadata])
+                yield from chunks
+            return
+
+        file_content = list(file_content)
         pdf_docs = [d for d in file_content if d.metadata.get("format") == "pdf"]
         other_docs = [d for d in file_content if d.metadata.get("format") != "pdf"]
 
-        chunks: list[Document] = []
-
         if pdf_docs:
-            chunks.extend(
-                self._chunk_pdf_documents(pdf_docs, text_splitter,
-                                          chunk_size, overlap_size)
-            )
+            with self.profiler.stage("chunking"):
+                chunks = self._chunk_pdf_documents(pdf_docs, text_splitter,
+                                                   chunk_size, overlap_size)
+            yield from chunks
 
         if other_docs:
             texts = [d.page_content for d in other_docs]
             metas = [d.metadata for d in other_docs]
-            chunks.extend(text_splitter.create_documents(texts, metadatas=metas))
-
-        return chunks
+            with self.profiler.stage("chunking"):
+                chunks = text_splitter.create_documents(texts, metadatas=metas)
+            yield from chunks
 
     # --- PDF chunk routing ---------------------------------------------------
     _ATOMIC_PDF_TYPES = frozenset({"table", "image", "page_scan"})
@@ -1241,3 +1918,85 @@ class processcontroller(basecontroller):
 
 
 
+# ----------------------------------------------------------------------
+# Parallel PDF parsing helpers (module level so they pickle into workers)
+# ----------------------------------------------------------------------
+class _CapturedPdfTable:
+    """
+    Picklable stand-in for a ``fitz`` table, exposing just the surface
+    ``_serialize_table`` reads (``extract()`` and ``header.names``).
+    """
+
+    def __init__(self, rows, header_names):
+        self._rows = rows
+        self.header = type("_Header", (), {"names": header_names})()
+
+    def extract(self):
+        return self._rows
+
+    @staticmethod
+    def probe(table) -> dict:
+        try:
+            rows = table.extract()
+        except Exception:
+            rows = None
+        try:
+            names = getattr(getattr(table, "header", None), "names", None)
+            names = list(names) if names else None
+        except Exception:
+            names = None
+        return {"rows": rows, "header_names": names}
+
+
+def _parse_xlsx_sheet(args) -> list[Document]:
+    """
+    Pool entry point: serialize one sheet of an .xlsx workbook. Runs in a
+    worker process with its own read-only workbook handle.
+    """
+    import openpyxl
+
+    project_id, file_path, sheet_name = args
+    controller = processcontroller(project_id=project_id)
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return list(controller._iter_xlsx_sheet_documents(
+            workbook[sheet_name], file_path, sheet_name
+        ))
+    finally:
+        workbook.close()
+
+
+def _parse_pdf_shard(args) -> dict:
+    """
+    Pool entry point: parse one contiguous page range of a PDF.
+
+    Runs in a worker process, so it builds its own controller, opens its own
+    ``fitz`` handle and — when the parent had vision enabled — creates its
+    own vision client from the shared settings.
+    """
+    import fitz
+
+    project_id, file_path, start, end, vision_ready = args
+
+    vision_client = None
+    if vision_ready:
+        from stores.vision import VisionProviderFactory
+        vision_client = VisionProviderFactory(get_config()).create()
+
+    controller = processcontroller(project_id=project_id, vision_client=vision_client)
+    controller._last_pdf_columns = {}
+
+    # Stages are handed back to the parent's profiler, not exported here.
+    with controller.profiler.file(os.path.basename(file_path), export=False) as profile:
+        doc = fitz.open(file_path)
+        try:
+            shard = controller._parse_pdf_page_range(
+                doc, start, end, file_path,
+                vision_ready=controller._vision_ready(),
+                record_carry_probes=True,
+            )
+        finally:
+            doc.close()
+    shard["profile"] = {"stages": profile["stages"], "counts": profile["counts"]}
+    return shard
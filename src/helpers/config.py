@@ -15,6 +15,9 @@ class Config(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
+    # Connection pool of the long-lived per-worker engine (see celery_app)
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
 
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
@@ -24,6 +27,20 @@ class Config(BaseSettings):
     VECTOR_DB_NAME: str
     VECTOR_DB_DISTANCE_METHOD: str
     VECTOR_DB_PGVEC_INDEX_THRESHOLD : int = 1000
+    # Bulk-load PGVector rows with binary COPY (falls back to batched INSERT)
+    VECTOR_DB_PGVEC_BULK_COPY: bool = True
+    # Indexing tasks skip per-page index checks and build the index once at the
+    # end (CREATE INDEX CONCURRENTLY) with these HNSW / maintenance settings.
+    VECTOR_DB_PGVEC_DEFER_INDEX: bool = True
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: Optional[str] = None
+    VECTOR_DB_PGVEC_MAINTENANCE_WORKERS: Optional[int] = None
+    # Default ANN search effort (hnsw.ef_search / ivfflat.probes / Qdrant
+    # hnsw_ef) when neither the request nor the project sets one.
+    VECTOR_DB_SEARCH_EFFORT: Optional[int] = None
+    # Per-process cache of collection existence / index state (0 disables)
+    VECTOR_DB_METADATA_CACHE_TTL_SECONDS: float = 30.0
 
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_API_URL: Optional[str] = None
@@ -45,6 +62,9 @@ class Config(BaseSettings):
     VISION_TIMEOUT_SECONDS: int = 60
     VISION_MAX_RETRIES: int = 3
     VISION_RETRY_BASE_SECONDS: float = 1.0
+    # Vision requests kept in flight at once while parsing one PDF (per
+    # parsing process when PDF_PARSE_WORKERS > 1).
+    VISION_MAX_CONCURRENCY: int = 4
 
     # Image optimization / guardrails
     VISION_MAX_IMAGE_BYTES: int = 4_000_000
@@ -53,11 +73,69 @@ class Config(BaseSettings):
     VISION_MAX_IMAGES_PER_PAGE: int = 8
     VISION_MIN_IMAGE_AREA_RATIO: float = 0.01
 
+    # Persistent result cache keyed by optimized image hash + prompt +
+    # provider + model. Defaults to an SQLite file under assets/database.
+    VISION_CACHE_ENABLED: bool = True
+    VISION_CACHE_PATH: Optional[str] = None
+    VISION_CACHE_MAX_MB: int = 256
+
+    # ========================= PDF Parsing Config =========================
+    # Process-pool workers used to parse the pages of one long PDF in
+    # parallel. 1 keeps the sequential page walk.
+    PDF_PARSE_WORKERS: int = 1
+
+    # Chunks are streamed from the loaders and written in batches of this size
+    CHUNK_INSERT_BATCH_SIZE: int = 500
+
+    # ========================= Structured Data Config =========================
+    # CSV files of at least CSV_STREAM_MIN_MB are read CSV_STREAM_CHUNK_ROWS
+    # rows at a time instead of loading the whole frame (0 = always stream).
+    CSV_STREAM_MIN_MB: int = 64
+    CSV_STREAM_CHUNK_ROWS: int = 50_000
+    # Process-pool workers used to parse the sheets of one .xlsx workbook in
+    # parallel. 1 streams the sheets in order in-process.
+    EXCEL_PARSE_WORKERS: int = 1
 
     GENERATION_MODEL_ID: Optional[str] = None
     EMBEDDING_MODEL_ID: Optional[str] = None
     EMBEDDING_MODEL_SIZE: Optional[int] = None
 
+    # Document embedding during indexing: texts per provider call (Cohere
+    # caps this at 96), batches in flight at once, and retries per batch.
+    EMBEDDING_BATCH_SIZE: int = 96
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_MAX_RETRIES: int = 3
+
+    # Persistent document-embedding cache (embedding_cache table), keyed by
+    # backend, model, dimension, document type and processed-text SHA-256.
+    # Entries unused for MAX_AGE_DAYS, or beyond MAX_ENTRIES most recently
+    # used, are evicted by the daily maintenance task.
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_AGE_DAYS: int = 30
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1_000_000
+
+    # Query embeddings on the search/answer path: per-process LRU of
+    # MAX_ENTRIES expiring after TTL_SECONDS (0 disables), plus an optional
+    # Redis tier shared by every API worker.
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = 2048
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    QUERY_EMBEDDING_CACHE_REDIS_URL: Optional[str] = None
+
+    # Search results cached in Redis per (collection, index version, query,
+    # limit, threshold, search effort). Indexing and resets bump the
+    # collection's version, so stale entries are never read. Unset URL = off.
+    RETRIEVAL_CACHE_REDIS_URL: Optional[str] = None
+    RETRIEVAL_CACHE_TTL_SECONDS: int = 300
+
+    # Semantic answer cache (per-project opt-in, stored in the retrieval
+    # cache's Redis): a question whose embedding has cosine similarity of at
+    # least SIMILARITY_THRESHOLD to a cached one, against the same index
+    # version, gets the cached answer. MAX_ENTRIES bounds each partition;
+    # every lookup fetches and scans the whole partition, so keep it small.
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    ANSWER_CACHE_MAX_ENTRIES: int = 64
+    ANSWER_CACHE_TTL_SECONDS: int = 86400
+
     INPUT_DEFAULT_MAX_CHARACTERS: Optional[int] = None
     GENERATION_DEFAULT_MAX_TOKENS: Optional[int] = None
     GENERATION_DEFAULT_TEMPERATURE: Optional[float] = None
@@ -73,6 +151,13 @@ class Config(BaseSettings):
     CELERY_TASK_ACKS_LATE: bool = True
     CELERY_WORKER_CONCURRENCY: int = 2
     CELERY_FLOWER_PASSWORD: str
+    # Port for the worker's Prometheus /metrics endpoint (ingestion stage
+    # histograms). Unset disables it. Prefork workers also need
+    # PROMETHEUS_MULTIPROC_DIR in the environment to aggregate children.
+    CELERY_METRICS_PORT: Optional[int] = None
+    # When set, every file-processing task is run under cProfile and its
+    # .prof dump written to this directory.
+    INGESTION_PROFILE_DIR: Optional[str] = None
 
     @field_validator(
         'OPENAI_API_KEY', 'OPENAI_API_URL', 'COHERE_API_KEY', 'GROQ_API_KEY',
@@ -80,6 +165,11 @@ class Config(BaseSettings):
         'INPUT_DEFAULT_MAX_CHARACTERS', 'GENERATION_DEFAULT_MAX_TOKENS',
         'GENERATION_DEFAULT_TEMPERATURE',
         'VISION_PROVIDER', 'GEMINI_API_KEY', 'MISTRAL_API_KEY', 'VISION_MODEL_ID',
+        'VISION_CACHE_PATH',
+        'VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM', 'VECTOR_DB_PGVEC_MAINTENANCE_WORKERS',
+        'VECTOR_DB_SEARCH_EFFORT',
+        'CELERY_METRICS_PORT', 'INGESTION_PROFILE_DIR',
+        'QUERY_EMBEDDING_CACHE_REDIS_URL', 'RETRIEVAL_CACHE_REDIS_URL',
         mode='before'
     )
     @classmethod
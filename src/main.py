@@ -6,8 +6,9 @@ from routes.status import status_router
 from routes.user import user_router
 from helpers.config import Config
 from contextlib import asynccontextmanager
-from stores.llm import LLMProviderFactory
-from stores.vectordb import VectorDBProviderFactory
+import asyncio
+from stores.llm import LLMProviderFactory, QueryEmbeddingCache, SemanticAnswerCache
+from stores.vectordb import VectorDBProviderFactory, RetrievalCache
 from stores.vision import VisionProviderFactory
 
 from stores.llm.templates.template_parser import TemplateParser
@@ -15,7 +16,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 # Import metrics setup
-from utils.metrics import setup_metrics
+from utils.metrics import setup_metrics, monitor_event_loop_lag
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -41,6 +42,19 @@ async def lifespan(app: FastAPI):
     app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(model_id = settings.EMBEDDING_MODEL_ID, embedding_size = settings.EMBEDDING_MODEL_SIZE)
 
+    # query embedding cache shared by this process's requests
+    app.query_embedding_cache = QueryEmbeddingCache(
+        max_entries=settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        redis_url=settings.QUERY_EMBEDDING_CACHE_REDIS_URL,
+    )
+
+    # versioned search-result cache (None when not configured)
+    app.retrieval_cache = RetrievalCache.from_config(settings)
+
+    # semantic answer cache for opted-in projects (None when not configured)
+    app.answer_cache = SemanticAnswerCache.from_config(settings)
+
     # vector db client
     app.vectordb_client = vectordb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
     await app.vectordb_client.connect()
@@ -57,10 +71,18 @@ async def lifespan(app: FastAPI):
         default_language=settings.DEFAULT_LANG,
     )
 
-    
+    # event-loop lag gauge (blocking calls on the request path show up here)
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+
     yield
     
     # Shutdown
+    lag_monitor.cancel()
+    await app.query_embedding_cache.close()
+    if app.retrieval_cache is not None:
+        await app.retrieval_cache.close()
+    if app.answer_cache is not None:
+        await app.answer_cache.close()
     await app.db_engine.dispose()
     await app.vectordb_client.disconnect()
 
@@ -1,7 +1,7 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import Asset
 from sqlalchemy.future import select
-from sqlalchemy import func  
+from sqlalchemy import func, update
 from models.enums.AssetTypeEnum import AssetTypeEnum  
 
 class AssetModel(BaseDataModel):
@@ -57,6 +57,17 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
         return record
     
+    async def update_asset_config(self, asset_id: int, asset_config: dict):
+        """Replace an asset's ``asset_config`` JSON."""
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Asset)
+                    .where(Asset.asset_id == asset_id)
+                    .values(asset_config=asset_config)
+                )
+        return asset_config
+
     # For Idempotency checks
     async def get_project_files_count(self, project_id: int) -> int:
         """
@@ -1,7 +1,7 @@
 from .BaseDataModel import BaseDataModel
 from .db_schemes import DataChunk
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update
 
 class ChunkModel(BaseDataModel):
 
@@ -47,6 +47,20 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
     
+    async def get_asset_chunk_ids(self, asset_id: int) -> list:
+        async with self.db_client() as session:
+            stmt = select(DataChunk.chunk_id).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            chunk_ids = list(result.scalars().all())
+        return chunk_ids
+
+    async def delete_chunks_by_asset_id(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
     async def get_project_chunks(self, db_project_id: int, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
             stmt = select(DataChunk).where(DataChunk.chunk_project_id == db_project_id).offset((page_no - 1) * page_size).limit(page_size)
@@ -54,10 +68,77 @@ class ChunkModel(BaseDataModel):
             records = result.scalars().all()
         return records
     
-    async def get_total_chunks_count(self, project_id: int):
+    async def iter_project_chunks(self, db_project_id: int, page_size: int=500,
+                                  only_unindexed: bool=False):
+        """
+        Stream a project's chunks as batches of up to ``page_size``, ordered by
+        ``chunk_id``; with ``only_unindexed``, just those not yet in the
+        vector store.
+
+        Uses keyset pagination (``chunk_id > last_seen``) instead of OFFSET, so
+        every page is an index range scan regardless of depth, and each page is
+        read in its own short session so no transaction stays open while the
+        caller works on a batch.
+        """
+        last_chunk_id = 0
+        while True:
+            async with self.db_client() as session:
+                stmt = (
+                    select(DataChunk)
+                    .where(DataChunk.chunk_project_id == db_project_id,
+                           DataChunk.chunk_id > last_chunk_id)
+                    .order_by(DataChunk.chunk_id)
+                    .limit(page_size)
+                )
+                if only_unindexed:
+                    stmt = stmt.where(DataChunk.chunk_indexed.is_(False))
+                result = await session.execute(stmt)
+                records = result.scalars().all()
+
+            if not records:
+                return
+
+            yield records
+
+            if len(records) < page_size:
+                return
+            last_chunk_id = records[-1].chunk_id
+
+    async def mark_chunks_indexed(self, chunk_ids: list):
+        async with self.db_client() as session:
+            stmt = update(DataChunk).where(DataChunk.chunk_id.in_(chunk_ids)).values(chunk_indexed=True)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def reset_project_chunks_indexed(self, db_project_id: int):
+        """Mark every chunk of the project as not indexed (e.g. after its collection is recreated)."""
+        async with self.db_client() as session:
+            stmt = update(DataChunk).where(
+                DataChunk.chunk_project_id == db_project_id,
+                DataChunk.chunk_indexed.is_(True)
+            ).values(chunk_indexed=False)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def get_chunks_state_version(self, project_id: int) -> int:
+        """
+        Highest chunk_id of the project. Chunk ids only grow, so any added or
+        re-processed chunk changes this value (used as an idempotency version).
+        """
+        async with self.db_client() as session:
+            stmt = select(func.max(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            result = await session.execute(stmt)
+            max_chunk_id = result.scalar()
+        return max_chunk_id or 0
+
+    async def get_total_chunks_count(self, project_id: int, only_unindexed: bool = False):
         total_count = 0
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            if only_unindexed:
+                count_sql = count_sql.where(DataChunk.chunk_indexed.is_(False))
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
         
@@ -0,0 +1,111 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCache
+from sqlalchemy.future import select
+from sqlalchemy import func, delete, update, text
+from sqlalchemy.dialects.postgresql import insert
+import hashlib
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def get_cached_vectors(self, embedding_backend: str, embedding_model_id: str,
+                                 embedding_size: int, document_type: str,
+                                 text_hashes: list) -> dict:
+        """
+        Bulk lookup. Returns ``{text_hash: vector}`` for the hashes found and
+        refreshes their ``last_used_at`` so age-based eviction behaves as LRU.
+        """
+        if not text_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = select(
+                    EmbeddingCache.embedding_id,
+                    EmbeddingCache.text_hash,
+                    EmbeddingCache.embedding_vector,
+                ).where(
+                    EmbeddingCache.embedding_backend == embedding_backend,
+                    EmbeddingCache.embedding_model_id == embedding_model_id,
+                    EmbeddingCache.embedding_size == embedding_size,
+                    EmbeddingCache.document_type == document_type,
+                    EmbeddingCache.text_hash.in_(set(text_hashes)),
+                )
+                result = await session.execute(stmt)
+                records = result.all()
+
+                if records:
+                    await session.execute(
+                        update(EmbeddingCache)
+                        .where(EmbeddingCache.embedding_id.in_([r.embedding_id for r in records]))
+                        .values(last_used_at=func.now())
+                    )
+
+        return {r.text_hash: list(r.embedding_vector) for r in records}
+
+    async def insert_vectors(self, embedding_backend: str, embedding_model_id: str,
+                             embedding_size: int, document_type: str,
+                             vectors_by_hash: dict, batch_size: int = 500) -> int:
+        """Bulk insert ``{text_hash: vector}``; existing keys are left untouched."""
+        rows = [
+            {
+                "embedding_backend": embedding_backend,
+                "embedding_model_id": embedding_model_id,
+                "embedding_size": embedding_size,
+                "document_type": document_type,
+                "text_hash": text_hash,
+                "embedding_vector": vector,
+            }
+            for text_hash, vector in vectors_by_hash.items()
+        ]
+        if not rows:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(rows), batch_size):
+                    stmt = insert(EmbeddingCache).values(rows[i:i + batch_size])
+                    stmt = stmt.on_conflict_do_nothing(index_elements=[
+                        EmbeddingCache.embedding_backend,
+                        EmbeddingCache.embedding_model_id,
+                        EmbeddingCache.embedding_size,
+                        EmbeddingCache.document_type,
+                        EmbeddingCache.text_hash,
+                    ])
+                    await session.execute(stmt)
+        return len(rows)
+
+    async def evict_unused_entries(self, max_age_seconds: int) -> int:
+        """Delete entries not used for ``max_age_seconds``."""
+        async with self.db_client() as session:
+            stmt = delete(EmbeddingCache).where(
+                EmbeddingCache.last_used_at < func.now() - text(f"INTERVAL '{int(max_age_seconds)} seconds'")
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def evict_to_max_entries(self, max_entries: int) -> int:
+        """Keep only the ``max_entries`` most recently used entries."""
+        async with self.db_client() as session:
+            keep = (
+                select(EmbeddingCache.embedding_id)
+                .order_by(EmbeddingCache.last_used_at.desc())
+                .limit(max_entries)
+            )
+            stmt = delete(EmbeddingCache).where(EmbeddingCache.embedding_id.not_in(keep))
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
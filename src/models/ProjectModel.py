@@ -3,7 +3,8 @@ from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import func, update
+from typing import Optional
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -109,4 +110,28 @@ class ProjectModel(BaseDataModel):
                 query = select(Project).where(Project.id == project_id)
                 result = await session.execute(query)
                 project = result.scalar_one_or_none()
-                return project
\ No newline at end of file
+                return project
+
+    async def update_project_search_effort(self, project: Project, search_effort: Optional[int]):
+        """Set (or clear with None) the project's default vector search effort."""
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Project)
+                    .where(Project.id == project.id)
+                    .values(project_search_effort=search_effort)
+                )
+        project.project_search_effort = search_effort
+        return project
+
+    async def update_project_answer_cache(self, project: Project, enabled: bool):
+        """Turn the project's semantic answer cache on or off."""
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Project)
+                    .where(Project.id == project.id)
+                    .values(project_answer_cache_enabled=enabled)
+                )
+        project.project_answer_cache_enabled = enabled
+        return project
@@ -0,0 +1,28 @@
+"""add project_answer_cache_enabled to projects
+
+Revision ID: a9d3e7c1f5b2
+Revises: f1c4d9e6a2b8
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e7c1f5b2'
+down_revision: Union[str, Sequence[str], None] = 'f1c4d9e6a2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-project opt-in for the semantic answer cache (off for existing projects)."""
+    op.add_column('projects', sa.Column('project_answer_cache_enabled', sa.Boolean(),
+                                        server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Drop the semantic answer cache opt-in."""
+    op.drop_column('projects', 'project_answer_cache_enabled')
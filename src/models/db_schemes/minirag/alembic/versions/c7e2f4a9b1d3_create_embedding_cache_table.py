@@ -0,0 +1,46 @@
+"""create embedding_cache table
+
+Revision ID: c7e2f4a9b1d3
+Revises: b4c9d8e2f3a5
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e2f4a9b1d3'
+down_revision: Union[str, Sequence[str], None] = 'b4c9d8e2f3a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the embedding cache keyed by backend/model/size/type/text hash."""
+    op.create_table('embedding_cache',
+    sa.Column('embedding_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('embedding_backend', sa.String(length=50), nullable=False),
+    sa.Column('embedding_model_id', sa.String(length=255), nullable=False),
+    sa.Column('embedding_size', sa.Integer(), nullable=False),
+    sa.Column('document_type', sa.String(length=20), nullable=False),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('embedding_vector', postgresql.ARRAY(sa.Float()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('embedding_id')
+    )
+    op.create_index('ix_embedding_cache_key', 'embedding_cache',
+                    ['embedding_backend', 'embedding_model_id', 'embedding_size',
+                     'document_type', 'text_hash'], unique=True)
+    op.create_index('ix_embedding_cache_last_used_at', 'embedding_cache',
+                    ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the embedding cache."""
+    op.drop_index('ix_embedding_cache_last_used_at', table_name='embedding_cache')
+    op.drop_index('ix_embedding_cache_key', table_name='embedding_cache')
+    op.drop_table('embedding_cache')
@@ -0,0 +1,28 @@
+"""add chunk (project_id, chunk_id) keyset index
+
+Revision ID: d2b6e1c8f4a7
+Revises: c7e2f4a9b1d3
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b6e1c8f4a7'
+down_revision: Union[str, Sequence[str], None] = 'c7e2f4a9b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index chunks by (project, chunk_id) so keyset pages are index range scans."""
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks',
+                    ['chunk_project_id', 'chunk_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the keyset index."""
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='chunks')
@@ -0,0 +1,27 @@
+"""add project_search_effort to projects
+
+Revision ID: e5f3a7b2c9d4
+Revises: d2b6e1c8f4a7
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f3a7b2c9d4'
+down_revision: Union[str, Sequence[str], None] = 'd2b6e1c8f4a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Per-project default vector search effort (NULL = app default)."""
+    op.add_column('projects', sa.Column('project_search_effort', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the per-project search effort."""
+    op.drop_column('projects', 'project_search_effort')
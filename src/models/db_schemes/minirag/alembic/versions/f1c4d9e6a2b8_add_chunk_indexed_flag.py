@@ -0,0 +1,36 @@
+"""add chunk_indexed flag to chunks
+
+Revision ID: f1c4d9e6a2b8
+Revises: e5f3a7b2c9d4
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c4d9e6a2b8'
+down_revision: Union[str, Sequence[str], None] = 'e5f3a7b2c9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Track per-chunk indexing state. Existing chunks start as not indexed; the
+    next push replaces their vectors once (indexing deletes a chunk's old
+    vectors before inserting), after which only new chunks are embedded.
+    """
+    op.add_column('chunks', sa.Column('chunk_indexed', sa.Boolean(),
+                                      server_default=sa.false(), nullable=False))
+    op.create_index('ix_chunk_project_id_unindexed', 'chunks',
+                    ['chunk_project_id', 'chunk_id'], unique=False,
+                    postgresql_where=sa.text('chunk_indexed IS false'))
+
+
+def downgrade() -> None:
+    """Drop the per-chunk indexing state."""
+    op.drop_index('ix_chunk_project_id_unindexed', table_name='chunks')
+    op.drop_column('chunks', 'chunk_indexed')
@@ -3,4 +3,5 @@ from .user import User
 from .asset import Asset
 from .project import Project
 from .datachunk import DataChunk, RetrievedDocument
-from .celery_task_execution import CeleryTaskExecution
\ No newline at end of file
+from .celery_task_execution import CeleryTaskExecution
+from .embedding_cache import EmbeddingCache
\ No newline at end of file
@@ -1,5 +1,5 @@
 from .minirag_base import SQLAlchemyBase
-from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, Boolean, false
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
@@ -20,6 +20,10 @@ class DataChunk(SQLAlchemyBase):
     chunk_project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     chunk_asset_id = Column(Integer, ForeignKey("assets.asset_id"), nullable=False)
 
+    # Set once the chunk's vector is in the project's collection; indexing
+    # only streams chunks where this is still false.
+    chunk_indexed = Column(Boolean, nullable=False, default=False, server_default=false())
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
@@ -29,6 +33,10 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_chunk_project_id', chunk_project_id),
         Index('ix_chunk_asset_id', chunk_asset_id),
+        # Keyset pagination over a project's chunks (ChunkModel.iter_project_chunks)
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
+        Index('ix_chunk_project_id_unindexed', chunk_project_id, chunk_id,
+              postgresql_where=chunk_indexed.is_(False)),
     )
 
 class RetrievedDocument(BaseModel):
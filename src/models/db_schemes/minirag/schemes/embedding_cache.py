@@ -0,0 +1,29 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, Float
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Index
+
+class EmbeddingCache(SQLAlchemyBase):
+
+    __tablename__ = "embedding_cache"
+
+    embedding_id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Cache key: the same text embedded by a different backend, model,
+    # dimension or input type (document vs query) is a different vector.
+    embedding_backend = Column(String(50), nullable=False)
+    embedding_model_id = Column(String(255), nullable=False)
+    embedding_size = Column(Integer, nullable=False)
+    document_type = Column(String(20), nullable=False)
+    text_hash = Column(String(64), nullable=False)  # SHA-256 of the processed text
+
+    embedding_vector = Column(ARRAY(Float), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_embedding_cache_key', embedding_backend, embedding_model_id,
+              embedding_size, document_type, text_hash, unique=True),
+        Index('ix_embedding_cache_last_used_at', last_used_at),
+    )
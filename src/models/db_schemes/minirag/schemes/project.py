@@ -1,5 +1,5 @@
 from .minirag_base import SQLAlchemyBase
-from sqlalchemy import Column, Integer, DateTime, func, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, func, ForeignKey, UniqueConstraint, Boolean, false
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
@@ -18,6 +18,15 @@ class Project(SQLAlchemyBase):
     # Multiple users can have the same project_id; they are distinguished by user_id.
     user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
 
+    # Default vector search effort (hnsw.ef_search / ivfflat.probes / Qdrant
+    # hnsw_ef) for this project's collection; NULL uses VECTOR_DB_SEARCH_EFFORT.
+    project_search_effort = Column(Integer, nullable=True)
+
+    # Opt-in semantic answer cache: near-duplicate questions are answered
+    # from earlier generations while the collection's index is unchanged.
+    project_answer_cache_enabled = Column(Boolean, nullable=False, default=False,
+                                          server_default=false())
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
@@ -19,6 +19,8 @@ class responsesignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved ✅"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error ❗"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success ✅"
+    VECTORDB_SEARCH_EFFORT_UPDATED = "vectordb_search_effort_updated ✅"
+    ANSWER_CACHE_UPDATED = "answer_cache_updated ✅"
     RAG_ANSWER_ERROR = "rag_answer_error ❗"
     RAG_ANSWER_SUCCESS = "rag_answer_success ✅"
     PROCESS_AND_PUSH_READY="processing_initiated"
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, SearchEffortRequest, AnswerCacheRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
@@ -9,6 +9,7 @@ from models import responsesignal
 from tasks.data_indexing import index_data_content
 from routes.auth import get_current_user
 
+import json
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -47,11 +48,13 @@ async def push_index(
    
    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
    total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.id)
+   chunks_state_version = await chunk_model.get_chunks_state_version(project_id=project.id)
 
    task = index_data_content.delay(
         project_id=project.id,
         do_reset=push_request.do_reset,
-        total_chunks_count=total_chunks_count 
+        total_chunks_count=total_chunks_count,
+        chunks_state_version=chunks_state_version
     )
 
    return JSONResponse(
@@ -104,6 +107,82 @@ async def get_project_index_info(
         }
     )
 
+@nlp_router.post("/index/search-effort/{project_id}")
+async def set_project_search_effort(
+    request: Request,
+    project_id: int,
+    effort_request: SearchEffortRequest,
+    current_user = Depends(get_current_user)
+):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_user_project(
+        project_id=project_id,
+        user_id=current_user.user_id
+    )
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": responsesignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+
+    project = await project_model.update_project_search_effort(
+        project=project,
+        search_effort=effort_request.search_effort
+    )
+
+    return JSONResponse(
+        content={
+            "signal": responsesignal.VECTORDB_SEARCH_EFFORT_UPDATED.value,
+            "search_effort": project.project_search_effort
+        }
+    )
+
+@nlp_router.post("/index/answer-cache/{project_id}")
+async def set_project_answer_cache(
+    request: Request,
+    project_id: int,
+    cache_request: AnswerCacheRequest,
+    current_user = Depends(get_current_user)
+):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_user_project(
+        project_id=project_id,
+        user_id=current_user.user_id
+    )
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": responsesignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+
+    project = await project_model.update_project_answer_cache(
+        project=project,
+        enabled=cache_request.enabled
+    )
+
+    return JSONResponse(
+        content={
+            "signal": responsesignal.ANSWER_CACHE_UPDATED.value,
+            "enabled": project.project_answer_cache_enabled,
+            # the cache needs RETRIEVAL_CACHE_REDIS_URL; opting in is a no-op without it
+            "available": request.app.answer_cache is not None
+        }
+    )
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(
     request: Request,
@@ -134,13 +213,16 @@ async def search_index(
        generation_client=request.app.generation_client,
        template_parser=request.app.template_parser,
        embedding_client=request.app.embedding_client,
+       query_embedding_cache=request.app.query_embedding_cache,
+       retrieval_cache=request.app.retrieval_cache,
        )
     
     results = await nlp_controller.search_vector_db_collection(
         project=project,
         text=search_request.text,
         limit=search_request.limit,
-        score_threshold=search_request.score_threshold
+        score_threshold=search_request.score_threshold,
+        search_effort=search_request.search_effort,
     )
 
     if not results:
@@ -188,6 +270,9 @@ async def answer_index(
        generation_client=request.app.generation_client,
        template_parser=request.app.template_parser,
        embedding_client=request.app.embedding_client,
+       query_embedding_cache=request.app.query_embedding_cache,
+       retrieval_cache=request.app.retrieval_cache,
+       answer_cache=request.app.answer_cache,
        )
     
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
@@ -195,7 +280,8 @@ async def answer_index(
         query=search_request.text,
         limit=search_request.limit,
         score_threshold=search_request.score_threshold,
-        primary_lang=search_request.primary_lang
+        primary_lang=search_request.primary_lang,
+        search_effort=search_request.search_effort,
     )
 
     if not answer:
@@ -211,6 +297,142 @@ async def answer_index(
             "signal": responsesignal.RAG_ANSWER_SUCCESS.value,
             "answer": answer,
             "full_prompt": full_prompt,
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            # answers from the semantic answer cache carry no prompts
+            "cached": full_prompt is None
         }
-    )
\ No newline at end of file
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_index_stream(
+    request: Request,
+    project_id: int,
+    search_request: SearchRequest,
+    current_user = Depends(get_current_user)
+):
+    """
+    Streaming variant of /index/answer as server-sent events: a
+    ``retrieval`` event with the search results, ``token`` events with the
+    answer text as it is generated, then ``done`` carrying the source labels
+    (or ``error`` if generation fails midway). Answers served from the
+    semantic answer cache skip ``retrieval`` and arrive as a single
+    ``token`` event, with ``cached`` set in ``done``.
+    """
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_user_project(
+        project_id=project_id,
+        user_id=current_user.user_id
+    )
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": responsesignal.PROJECT_NOT_FOUND_ERROR.value
+            }
+        )
+
+    nlp_controller = NLPController(
+       vectordb_client=request.app.vectordb_client,
+       generation_client=request.app.generation_client,
+       template_parser=request.app.template_parser,
+       embedding_client=request.app.embedding_client,
+       query_embedding_cache=request.app.query_embedding_cache,
+       retrieval_cache=request.app.retrieval_cache,
+       answer_cache=request.app.answer_cache,
+       )
+
+    cached_answer, cache_slot = await nlp_controller.get_cached_answer(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        score_threshold=search_request.score_threshold,
+        primary_lang=search_request.primary_lang,
+        search_effort=search_request.search_effort,
+    )
+
+    if cached_answer:
+        async def cached_event_stream():
+            yield _sse_event("token", {"text": cached_answer["answer"]})
+            yield _sse_event("done", {
+                "signal": responsesignal.RAG_ANSWER_SUCCESS.value,
+                "sources": cached_answer["sources"],
+                "cached": True,
+            })
+
+        return StreamingResponse(
+            cached_event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    retrieved_documents, full_prompt, chat_history = await nlp_controller.prepare_rag_prompt(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        score_threshold=search_request.score_threshold,
+        primary_lang=search_request.primary_lang,
+        search_effort=search_request.search_effort,
+    )
+
+    if not retrieved_documents:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": responsesignal.RAG_ANSWER_ERROR.value
+                }
+        )
+
+    async def event_stream():
+        yield _sse_event("retrieval", {
+            "results": [ doc.model_dump() for doc in retrieved_documents ]
+        })
+
+        answer_parts = []
+        answer_stream = nlp_controller.stream_rag_answer(
+            full_prompt=full_prompt,
+            chat_history=chat_history
+        )
+        try:
+            async for text in answer_stream:
+                answer_parts.append(text)
+                yield _sse_event("token", {"text": text})
+        except Exception as e:
+            logger.error(f"Error while streaming RAG answer: {e}")
+            answer_parts = []
+        finally:
+            # On client disconnect this also closes the provider's stream.
+            await answer_stream.aclose()
+
+        if not answer_parts:
+            yield _sse_event("error", {"signal": responsesignal.RAG_ANSWER_ERROR.value})
+            return
+
+        sources = nlp_controller.build_source_labels(retrieved_documents)
+        await nlp_controller.store_cached_answer(
+            cache_slot=cache_slot,
+            query=search_request.text,
+            answer="".join(answer_parts),
+            sources=sources,
+            full_prompt=full_prompt,
+            chat_history=chat_history,
+        )
+
+        yield _sse_event("done", {
+            "signal": responsesignal.RAG_ANSWER_SUCCESS.value,
+            "sources": sources,
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,6 +4,16 @@ from helpers.config import get_config
 
 settings = get_config()
 
+MAX_SEARCH_EFFORT = 1000  # pgvector's hnsw.ef_search upper bound
+
+def _validate_search_effort(v: Optional[int]) -> Optional[int]:
+    if v is not None and not 1 <= v <= MAX_SEARCH_EFFORT:
+        raise ValueError(
+            f'search_effort must be between 1 and {MAX_SEARCH_EFFORT}. '
+            f'Current value: {v}.'
+        )
+    return v
+
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
@@ -12,6 +22,13 @@ class SearchRequest(BaseModel):
     limit: Optional[int] = 5
     score_threshold: Optional[float] = None
     primary_lang: Optional[str] = None
+    # Recall/latency knob for the ANN index; None uses the project default
+    search_effort: Optional[int] = None
+
+    @field_validator('search_effort')
+    @classmethod
+    def validate_search_effort(cls, v: int) -> int:
+        return _validate_search_effort(v)
 
     @field_validator('primary_lang')
     @classmethod
@@ -50,4 +67,18 @@ class SearchRequest(BaseModel):
                 f'Current value: {v}. '
                 f'Please provide a value of 10 or less.'
             )
-        return v
\ No newline at end of file
+        return v
+
+class SearchEffortRequest(BaseModel):
+    # None clears the project default (falls back to VECTOR_DB_SEARCH_EFFORT)
+    search_effort: Optional[int] = None
+
+    @field_validator('search_effort')
+    @classmethod
+    def validate_search_effort(cls, v: int) -> int:
+        return _validate_search_effort(v)
+
+
+class AnswerCacheRequest(BaseModel):
+    # Opt the project in or out of the semantic answer cache
+    enabled: bool
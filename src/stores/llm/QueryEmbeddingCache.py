@@ -0,0 +1,131 @@
+"""
+Two-tier cache for query embeddings.
+
+Users repeat questions and UIs re-submit them, and every /index/search or
+/index/answer call would otherwise pay a provider round trip to embed the
+same text again. :class:`QueryEmbeddingCache` keeps a bounded in-process LRU
+(entries expire after ``ttl_seconds``) and, when a Redis URL is configured,
+a shared tier so every uvicorn worker benefits from another's lookups.
+
+Keys are the SHA-256 of the embedding backend, model, dimension, document
+type and the processed query text. Redis failures never raise: they
+degrade to a miss.
+"""
+
+import hashlib
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+from utils.metrics import QUERY_EMBEDDING_CACHE_LOOKUPS
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis tier is optional
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0,
+                 redis_url: Optional[str] = None, redis_prefix: str = "query_embedding:"):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis_prefix = redis_prefix
+        # key -> (expires_at, vector), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self._redis = None
+        if redis_url:
+            if aioredis is None:
+                logger.warning("redis package unavailable; query embedding cache is in-process only")
+            else:
+                self._redis = aioredis.from_url(redis_url)
+
+    @staticmethod
+    def make_key(text: str, backend: str, model_id: Optional[str],
+                 embedding_size: Optional[int], document_type: Optional[str]) -> str:
+        digest = hashlib.sha256()
+        for part in (backend, model_id or "", str(embedding_size or ""), document_type or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> Optional[List[float]]:
+        vector = self._get_local(key)
+        if vector is not None:
+            self._record("local_hit")
+            return vector
+
+        if self._redis is not None:
+            try:
+                payload = await self._redis.get(self.redis_prefix + key)
+            except Exception as e:
+                logger.debug(f"Query embedding cache Redis lookup failed: {e}")
+                payload = None
+            if payload:
+                vector = array("d", payload).tolist()
+                self._set_local(key, vector)
+                self._record("redis_hit")
+                return vector
+
+        self._record("miss")
+        return None
+
+    async def set(self, key: str, vector: List[float]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._set_local(key, vector)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(self.redis_prefix + key, array("d", vector).tobytes(),
+                                      ex=max(1, int(self.ttl_seconds)))
+            except Exception as e:
+                logger.debug(f"Query embedding cache Redis store failed: {e}")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, vector = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def _set_local(self, key: str, vector: List[float]) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, vector)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _record(self, result: str) -> None:
+        if result == "miss":
+            self.misses += 1
+        else:
+            self.hits += 1
+        QUERY_EMBEDDING_CACHE_LOOKUPS.labels(result=result).inc()
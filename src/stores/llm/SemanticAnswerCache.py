@@ -0,0 +1,186 @@
+"""
+Redis cache of generated RAG answers, looked up by query similarity.
+
+Paraphrases of the same FAQ would each pay for a vector search and a full
+generation call. :class:`SemanticAnswerCache` stores, per *partition*, the
+normalized embedding of every answered query next to its answer and source
+labels; a new question whose embedding reaches ``similarity_threshold``
+(cosine) against the nearest stored one gets that answer back. The
+similarity scan runs in a worker thread so it does not stall the event
+loop.
+
+A partition is one collection at one index version (see
+``stores.vectordb.RetrievalCache``) for one generation model, template
+language and set of retrieval parameters, so re-indexing a project makes
+its cached answers unreachable, like cached search results; they expire
+after ``ttl_seconds``. Each partition keeps at most ``max_entries`` answers
+(most recently stored first), which also bounds each lookup's transfer and
+scan; keep it small.
+
+Redis failures never raise: lookups degrade to a miss and stores are
+dropped with a warning.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import operator
+from array import array
+from typing import List, NamedTuple, Optional
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerCacheSlot(NamedTuple):
+    """Where a query's answer is looked up and, on a miss, stored."""
+    partition: str
+    query_vector: List[float]
+
+
+class SemanticAnswerCache:
+
+    def __init__(self, redis_url: str, similarity_threshold: float = 0.95,
+                 max_entries: int = 64, ttl_seconds: int = 86400, prefix: str = "answer:"):
+        if aioredis is None:
+            raise RuntimeError("The redis package is required for the answer cache")
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._redis = aioredis.from_url(redis_url)
+
+    @classmethod
+    def from_config(cls, config) -> Optional["SemanticAnswerCache"]:
+        """None when the retrieval cache's Redis is not configured (cache disabled)."""
+        if not config.RETRIEVAL_CACHE_REDIS_URL or config.ANSWER_CACHE_MAX_ENTRIES <= 0:
+            return None
+        return cls(redis_url=config.RETRIEVAL_CACHE_REDIS_URL,
+                   similarity_threshold=config.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+                   max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+                   ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS)
+
+    def make_partition(self, collection_name: str, index_version: int,
+                       generation_model_id: Optional[str], language: Optional[str],
+                       limit: int, score_threshold: Optional[float],
+                       search_effort: Optional[int]) -> str:
+        digest = hashlib.sha256()
+        for part in (generation_model_id or "", language or "", str(limit),
+                     repr(score_threshold), str(search_effort)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return f"{self.prefix}{collection_name}:{index_version}:{digest.hexdigest()[:16]}"
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token count (~4 characters per token) for the saved-token metric."""
+        return len(text) // 4 if text else 0
+
+    async def lookup(self, slot: AnswerCacheSlot) -> Optional[dict]:
+        """
+        The cached entry (``query``, ``answer``, ``sources``, token
+        estimates) of the most similar stored query, with its
+        ``similarity``, or None when none reaches the threshold.
+        """
+        query = self._normalize(slot.query_vector)
+        if query is None:
+            return None
+
+        try:
+            vectors = await self._redis.hgetall(f"{slot.partition}:vectors")
+        except Exception as e:
+            logger.debug(f"Answer cache lookup failed: {e}")
+            return None
+
+        best_id, best_similarity = None, -1.0
+        if vectors:
+            best_id, best_similarity = await asyncio.to_thread(self._nearest, query, vectors)
+
+        if best_id is None or best_similarity < self.similarity_threshold:
+            return None
+
+        try:
+            payload = await self._redis.hget(f"{slot.partition}:entries", best_id)
+        except Exception as e:
+            logger.debug(f"Answer cache lookup failed: {e}")
+            return None
+        if not payload:  # evicted between the two reads
+            return None
+
+        entry = json.loads(payload)
+        entry["similarity"] = round(best_similarity, 4)
+        return entry
+
+    async def store(self, slot: AnswerCacheSlot, query: str, answer: str, sources: List[dict],
+                    prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        vector = self._normalize(slot.query_vector)
+        if vector is None or not answer:
+            return
+
+        entry_id = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        entry = json.dumps({
+            "query": query,
+            "answer": answer,
+            "sources": sources,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }, ensure_ascii=False, default=str)
+
+        vectors_key = f"{slot.partition}:vectors"
+        entries_key = f"{slot.partition}:entries"
+        order_key = f"{slot.partition}:order"
+        ttl = max(1, int(self.ttl_seconds))
+
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(vectors_key, entry_id, vector.tobytes())
+                pipe.hset(entries_key, entry_id, entry)
+                pipe.lrem(order_key, 0, entry_id)
+                pipe.lpush(order_key, entry_id)
+                pipe.lrange(order_key, self.max_entries, -1)
+                pipe.ltrim(order_key, 0, self.max_entries - 1)
+                for key in (vectors_key, entries_key, order_key):
+                    pipe.expire(key, ttl)
+                results = await pipe.execute()
+
+            evicted = results[4]
+            if evicted:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    pipe.hdel(vectors_key, *evicted)
+                    pipe.hdel(entries_key, *evicted)
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Answer cache store failed: {e}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    @staticmethod
+    def _nearest(query: array, vectors: dict) -> tuple:
+        """``(entry_id, similarity)`` of the stored vector closest to ``query``."""
+        best_id, best_similarity = None, -1.0
+        for entry_id, payload in vectors.items():
+            candidate = array("f")
+            candidate.frombytes(payload)
+            if len(candidate) != len(query):
+                continue
+            similarity = sum(map(operator.mul, query, candidate))
+            if similarity > best_similarity:
+                best_id, best_similarity = entry_id, similarity
+        return best_id, best_similarity
+
+    @staticmethod
+    def _normalize(vector: Optional[List[float]]) -> Optional[array]:
+        """Unit-length float32 copy, so similarity is a plain dot product."""
+        if not vector:
+            return None
+        norm = math.sqrt(sum(x * x for x in vector))
+        if norm == 0:
+            return None
+        return array("f", (x / norm for x in vector))
@@ -1 +1,3 @@
-from .LLMProviderFactory import LLMProviderFactory
\ No newline at end of file
+from .LLMProviderFactory import LLMProviderFactory
+from .QueryEmbeddingCache import QueryEmbeddingCache
+from .SemanticAnswerCache import SemanticAnswerCache, AnswerCacheSlot
\ No newline at end of file
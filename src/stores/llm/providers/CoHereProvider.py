@@ -23,6 +23,7 @@ class CoHereProvider(LLMInterface):
         self.embedding_size = None
 
         self.client = cohere.ClientV2(api_key=self.api_key)
+        self.async_client = cohere.AsyncClientV2(api_key=self.api_key)
 
         self.enums = CoHereEnums
 
@@ -70,6 +71,74 @@ class CoHereProvider(LLMInterface):
             return None
         
         return response.message.content[0].text
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        messages = chat_history.copy()
+        messages.append(
+            self.construct_prompt(prompt=prompt, role=CoHereEnums.USER.value)
+        )
+
+        response = await self.async_client.chat(
+                model = self.generation_model_id,
+                messages = messages,
+                temperature = temperature,
+                max_tokens = max_output_tokens
+            )
+
+        if not response or not response.message or len(response.message) == 0 or not response.message.content[0].text:
+            self.logger.error("Error while generating text with CoHere")
+            return None
+
+        return response.message.content[0].text
+
+    async def generate_text_stream(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for CoHere was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        messages = chat_history.copy()
+        messages.append(
+            self.construct_prompt(prompt=prompt, role=CoHereEnums.USER.value)
+        )
+
+        events = self.async_client.chat_stream(
+            model = self.generation_model_id,
+            messages = messages,
+            temperature = temperature,
+            max_tokens = max_output_tokens
+        )
+
+        # Close the SDK stream (and its HTTP response) when the consumer stops early.
+        try:
+            async for event in events:
+                if event.type == "content-delta" and event.delta and event.delta.message:
+                    text = event.delta.message.content.text if event.delta.message.content else None
+                    if text:
+                        yield text
+        finally:
+            await events.aclose()
     
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         if not self.client:
@@ -99,6 +168,35 @@ class CoHereProvider(LLMInterface):
             return None
         
         return [ f for f in response.embeddings.float ]
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client was not set")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
+
+        response = await self.async_client.embed(
+            model = self.embedding_model_id,
+            texts = text,
+            input_type = input_type,
+            embedding_types=['float'],
+        )
+
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
+            return None
+
+        return [ f for f in response.embeddings.float ]
     
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -1,6 +1,6 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import GroqEnums
-from groq import Groq
+from groq import Groq, AsyncGroq
 import logging
 from typing import List, Union
 
@@ -27,6 +27,10 @@ class GroqProvider(LLMInterface):
             api_key=self.api_key
         )
 
+        self.async_client = AsyncGroq(
+            api_key=self.api_key
+        )
+
         self.enums = GroqEnums
 
         self.logger = logging.getLogger(__name__)
@@ -76,10 +80,84 @@ class GroqProvider(LLMInterface):
         except Exception as e:
             self.logger.error(f"Error while generating text with Groq: {str(e)}")
             return None
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("Groq async client was not set")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Groq was not set")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        messages = chat_history.copy()
+        messages.append(
+            self.construct_prompt(prompt=prompt, role=GroqEnums.USER.value)
+        )
+
+        try:
+            response = await self.async_client.chat.completions.create(
+                messages=messages,
+                model=self.generation_model_id,
+                temperature=temperature,
+                max_completion_tokens=max_output_tokens,
+            )
+
+            if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+                self.logger.error("Error: Empty response from Groq")
+                return None
+
+            return response.choices[0].message.content
+
+        except Exception as e:
+            self.logger.error(f"Error while generating text with Groq: {str(e)}")
+            return None
+
+    async def generate_text_stream(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("Groq async client was not set")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for Groq was not set")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
+        temperature = temperature if temperature else self.default_generation_temperature
+
+        messages = chat_history.copy()
+        messages.append(
+            self.construct_prompt(prompt=prompt, role=GroqEnums.USER.value)
+        )
+
+        stream = await self.async_client.chat.completions.create(
+            messages=messages,
+            model=self.generation_model_id,
+            temperature=temperature,
+            max_completion_tokens=max_output_tokens,
+            stream=True,
+        )
+
+        # Closes the HTTP response when the consumer stops early (client
+        # disconnect / cancellation), so the provider stops generating.
+        async with stream:
+            async for event in stream:
+                if event.choices and event.choices[0].delta and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
     
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         pass
 
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        pass
+
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class CollectionMetadataCache:
+    """
+    Per-process, TTL-bounded cache of vector collection metadata
+    (existence, embedding size, index state).
+
+    Only facts observed as true are cached, so a collection created by
+    another worker is seen on the very next lookup; one dropped elsewhere is
+    noticed at most ``ttl_seconds`` later. Local create/delete calls
+    invalidate their entry immediately. A ``ttl_seconds`` of 0 disables
+    caching.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(collection_name)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if expires_at <= time.monotonic():
+                self._entries.pop(collection_name, None)
+                return None
+            return fields.get(key)
+
+    def set(self, collection_name: str, **fields: Any) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            entry = self._entries.get(collection_name)
+            now = time.monotonic()
+            if entry is None or entry[0] <= now:
+                merged = dict(fields)
+            else:
+                merged = {**entry[1], **fields}
+            self._entries[collection_name] = (now + self.ttl_seconds, merged)
+
+    def invalidate(self, collection_name: str) -> None:
+        with self._lock:
+            self._entries.pop(collection_name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
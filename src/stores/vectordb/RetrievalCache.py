@@ -0,0 +1,93 @@
+"""
+Redis cache of vector search results, versioned per collection.
+
+Every entry key embeds the collection's current *index version*, a counter
+kept in Redis next to the entries. Whatever changes a collection's vectors
+(indexing, resets, per-asset replacement) bumps the counter, so later
+lookups build new keys and stale entries are never read again; they simply
+expire after ``ttl_seconds``. Nothing has to be deleted explicitly.
+
+Redis failures never raise: lookups degrade to a miss (the search runs
+against the vector DB as usual) and stores / bumps are dropped with a
+warning.
+"""
+
+import hashlib
+import json
+import logging
+from typing import List, Optional
+
+from models.db_schemes import RetrievedDocument
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalCache:
+
+    def __init__(self, redis_url: str, ttl_seconds: int = 300, prefix: str = "retrieval:"):
+        if aioredis is None:
+            raise RuntimeError("The redis package is required for the retrieval cache")
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._redis = aioredis.from_url(redis_url)
+
+    @classmethod
+    def from_config(cls, config) -> Optional["RetrievalCache"]:
+        """None when RETRIEVAL_CACHE_REDIS_URL is not set (cache disabled)."""
+        if not config.RETRIEVAL_CACHE_REDIS_URL:
+            return None
+        return cls(redis_url=config.RETRIEVAL_CACHE_REDIS_URL,
+                   ttl_seconds=config.RETRIEVAL_CACHE_TTL_SECONDS)
+
+    def _version_key(self, collection_name: str) -> str:
+        return f"{self.prefix}version:{collection_name}"
+
+    async def get_index_version(self, collection_name: str) -> Optional[int]:
+        """Current index version (0 before the first bump); None if Redis is unavailable."""
+        try:
+            version = await self._redis.get(self._version_key(collection_name))
+        except Exception as e:
+            logger.debug(f"Retrieval cache version lookup failed: {e}")
+            return None
+        return int(version) if version else 0
+
+    async def bump_index_version(self, collection_name: str) -> None:
+        try:
+            await self._redis.incr(self._version_key(collection_name))
+        except Exception as e:
+            logger.warning(f"Failed to bump index version of {collection_name}: {e}")
+
+    def make_key(self, collection_name: str, index_version: int, query_text: str,
+                 embedding_model_id: Optional[str], limit: int,
+                 score_threshold: Optional[float], search_effort: Optional[int]) -> str:
+        digest = hashlib.sha256()
+        for part in (embedding_model_id or "", str(limit), repr(score_threshold), str(search_effort)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(query_text.encode("utf-8"))
+        return f"{self.prefix}{collection_name}:{index_version}:{digest.hexdigest()}"
+
+    async def get(self, key: str) -> Optional[List[RetrievedDocument]]:
+        try:
+            payload = await self._redis.get(key)
+        except Exception as e:
+            logger.debug(f"Retrieval cache lookup failed: {e}")
+            return None
+        if not payload:
+            return None
+        return [RetrievedDocument(**doc) for doc in json.loads(payload)]
+
+    async def set(self, key: str, results: List[RetrievedDocument]) -> None:
+        payload = json.dumps([doc.model_dump() for doc in results], ensure_ascii=False, default=str)
+        try:
+            await self._redis.set(key, payload, ex=max(1, int(self.ttl_seconds)))
+        except Exception as e:
+            logger.warning(f"Retrieval cache store failed: {e}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
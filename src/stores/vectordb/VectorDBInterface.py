@@ -45,10 +45,20 @@ class VectorDBInterface(ABC):
                           vectors: List[List[float]], 
                           metadata: Optional[List[Optional[Dict[str, Any]]]] = None, 
                           record_ids: Optional[List[Optional[Union[str, int]]]] = None, 
-                          batch_size: int = 50) -> bool:
+                          batch_size: int = 50, create_index: bool = True) -> bool:
+        pass
+
+    @abstractmethod
+    def create_vector_index(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def delete_by_record_ids(self, collection_name: str,
+                                   record_ids: List[Union[str, int]]) -> int:
         pass
 
     @abstractmethod
     def search_by_vector(self, collection_name: str, vector: List[float], 
-                               limit: int = 5, score_threshold: Optional[float] = None) -> List[RetrievedDocument]:
+                               limit: int = 5, score_threshold: Optional[float] = None,
+                               search_effort: Optional[int] = None) -> List[RetrievedDocument]:
         pass
\ No newline at end of file
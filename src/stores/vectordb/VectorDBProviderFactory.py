@@ -18,6 +18,7 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                metadata_cache_ttl=self.config.VECTOR_DB_METADATA_CACHE_TTL_SECONDS,
             )
         
         if provider == VectorDBEnums.PGVECTOR.value:
@@ -26,6 +27,12 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                bulk_copy=self.config.VECTOR_DB_PGVEC_BULK_COPY,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                maintenance_workers=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORKERS,
+                metadata_cache_ttl=self.config.VECTOR_DB_METADATA_CACHE_TTL_SECONDS,
             )
         
         return None
\ No newline at end of file
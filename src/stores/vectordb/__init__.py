@@ -1 +1,2 @@
-from .VectorDBProviderFactory import VectorDBProviderFactory
\ No newline at end of file
+from .VectorDBProviderFactory import VectorDBProviderFactory
+from .RetrievalCache import RetrievalCache
\ No newline at end of file
@@ -1,20 +1,44 @@
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionMetadataCache import CollectionMetadataCache
 from ..VectorDBEnums import (DistanceMethodEnums, PgVectorTableSchemeEnums, 
                              PgVectorDistanceMethodEnums, PgVectorIndexTypeEnums)
 import logging
 from typing import List, Optional, Union, Dict, Any
 from models.db_schemes import RetrievedDocument
+from sqlalchemy import event
 from sqlalchemy.sql import text as sql_text
 import json
+import time
+
+try:
+    from pgvector.asyncpg import register_vector
+except ImportError:  # pragma: no cover - optional fast path
+    register_vector = None
 
 class PGVectorProvider(VectorDBInterface):
 
     def __init__(self, db_client, default_vector_size: int = 1024,
-                       distance_method: Optional[str] = None, index_threshold: int = 1000):
+                       distance_method: Optional[str] = None, index_threshold: int = 1000,
+                       bulk_copy: bool = True, hnsw_m: int = 16, hnsw_ef_construction: int = 64,
+                       maintenance_work_mem: Optional[str] = None,
+                       maintenance_workers: Optional[int] = None,
+                       metadata_cache_ttl: float = 30.0):
         
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
+        # HNSW build parameters and per-build server settings
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.maintenance_work_mem = maintenance_work_mem
+        self.maintenance_workers = maintenance_workers
+        # Saves the pg_tables / pg_indexes round trip on every search and insert
+        self.metadata_cache = CollectionMetadataCache(ttl_seconds=metadata_cache_ttl)
+        # Stream insert_many rows through binary COPY when the driver allows it
+        self.bulk_copy = bulk_copy and register_vector is not None
+        # Set by connect() once every pooled connection carries pgvector's
+        # binary codec; vectors are then bound as lists on every code path.
+        self.vector_codec = False
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = PgVectorDistanceMethodEnums.COSINE.value
@@ -33,6 +57,11 @@ class PGVectorProvider(VectorDBInterface):
     async def connect(self) -> None:
         """
         Establish connection and ensure pgvector extension is installed.
+
+        With the pgvector package available, the ``vector`` codec is then
+        registered once per pooled asyncpg connection (pool ``connect``
+        event). The pool is recycled afterwards so no connection opened
+        before the extension existed is left without the codec.
         """
         async with self.db_client() as session:
             async with session.begin():
@@ -41,16 +70,32 @@ class PGVectorProvider(VectorDBInterface):
                 ))
                 await session.commit()
 
+        engine = self.db_client.kw.get("bind")
+        if register_vector is None or engine is None or engine.dialect.driver != "asyncpg":
+            return
+
+        pool_engine = engine.sync_engine
+        if not event.contains(pool_engine, "connect", _register_vector_codec):
+            event.listen(pool_engine, "connect", _register_vector_codec)
+            await engine.dispose()
+        self.vector_codec = True
+
     async def disconnect(self):
-        pass
+        self.metadata_cache.clear()
 
     async def is_collection_existed(self, collection_name: str) -> bool:
+        if self.metadata_cache.get(collection_name, "exists"):
+            return True
+
         async with self.db_client() as session:
             async with session.begin():
                 list_tbl = sql_text('SELECT 1 FROM pg_tables WHERE tablename = :collection_name LIMIT 1')
                 results = await session.execute(list_tbl, {"collection_name": collection_name})
                 record = results.scalar_one_or_none()
 
+        if record is not None:
+            self.metadata_cache.set(collection_name, exists=True)
+
         return record is not None
     
     async def list_all_collections(self) -> List:
@@ -102,6 +147,8 @@ class PGVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS "{collection_name}" CASCADE')
                 await session.execute(delete_sql)
                 await session.commit()
+
+        self.metadata_cache.invalidate(collection_name)
         
         return True
 
@@ -123,6 +170,9 @@ class PGVectorProvider(VectorDBInterface):
             await self.delete_collection(collection_name=collection_name)
 
         is_collection_existed = await self.is_collection_existed(collection_name=collection_name)
+        if is_collection_existed:
+            await self._ensure_chunk_id_index(collection_name)
+
         if not is_collection_existed:
             self.logger.info(f"Creating new PGVector collection: {collection_name}")
             async with self.db_client() as session:
@@ -140,6 +190,9 @@ class PGVectorProvider(VectorDBInterface):
                     )
                     await session.execute(create_sql)
                     await session.commit()
+
+            self.metadata_cache.set(collection_name, exists=True, embedding_size=embedding_size)
+            await self._ensure_chunk_id_index(collection_name)
             
             return True
 
@@ -147,6 +200,20 @@ class PGVectorProvider(VectorDBInterface):
     
 
     
+    async def _ensure_chunk_id_index(self, collection_name: str) -> None:
+        """B-tree on chunk_id so per-chunk vector replacement/deletes avoid full scans."""
+        if self.metadata_cache.get(collection_name, "chunk_id_index"):
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    f'CREATE INDEX IF NOT EXISTS "{collection_name}_chunk_id_idx" '
+                    f'ON "{collection_name}" ({PgVectorTableSchemeEnums.CHUNK_ID.value})'
+                ))
+
+        self.metadata_cache.set(collection_name, chunk_id_index=True)
+
     async def is_index_existed(self, collection_name: str) -> bool:
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
@@ -164,12 +231,40 @@ class PGVectorProvider(VectorDBInterface):
                 })
                 
                 return results.scalar_one_or_none() is not None
-            
+
+    async def is_index_valid(self, collection_name: str) -> bool:
+        """False when the index is missing or left INVALID by a failed concurrent build."""
+        index_name = self.default_index_name(collection_name)
+        async with self.db_client() as session:
+            async with session.begin():
+                check_sql = sql_text("""
+                    SELECT i.indisvalid
+                    FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = :index_name
+                    LIMIT 1
+                """)
+                results = await session.execute(check_sql, {"index_name": index_name})
+
+                return bool(results.scalar_one_or_none())
+
+    def _index_options_sql(self, index_type: str) -> str:
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            return f' WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})'
+        return ''
+
     async def create_vector_index(self, collection_name: str,
                                         index_type: str = PgVectorIndexTypeEnums.HNSW.value) -> bool:
         """
         Create a vector index on the collection for efficient similarity search.
         Index is only created if record count exceeds threshold.
+
+        The index is built with ``CREATE INDEX CONCURRENTLY`` on an autocommit
+        connection, so the collection stays readable and writable while it is
+        built. ``maintenance_work_mem`` and ``max_parallel_maintenance_workers``
+        are raised for the build only and reset before the connection goes
+        back to the pool. An INVALID index left behind by an interrupted
+        concurrent build is dropped and rebuilt.
         
         Args:
             collection_name: Name of the collection.
@@ -178,32 +273,63 @@ class PGVectorProvider(VectorDBInterface):
         Returns:
             True if index was created, False otherwise.
         """
+        index_name = self.default_index_name(collection_name)
+
+        if self.metadata_cache.get(collection_name, "index_valid"):
+            return False
+
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
         if is_index_existed:
-            return False
-        
+            if await self.is_index_valid(collection_name=collection_name):
+                self.metadata_cache.set(collection_name, index_valid=True)
+                return False
+            self.logger.warning(f"Dropping invalid vector index for collection: {collection_name}")
+
         async with self.db_client() as session:
             async with session.begin():
                 count_sql = sql_text(f'SELECT COUNT(*) FROM "{collection_name}"')
                 result = await session.execute(count_sql)
                 records_count = result.scalar_one()
 
-                if records_count < self.index_threshold:
-                    return False
-                
-                self.logger.info(f"START: Creating vector index for collection: {collection_name}")
-                
-                index_name = self.default_index_name(collection_name)
+        if records_count < self.index_threshold:
+            return False
+
+        async with self.db_client() as session:
+            # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            try:
+                if is_index_existed:
+                    await connection.execute(sql_text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
+
+                if self.maintenance_work_mem:
+                    await connection.execute(
+                        sql_text("SELECT set_config('maintenance_work_mem', :value, false)"),
+                        {"value": str(self.maintenance_work_mem)},
+                    )
+                if self.maintenance_workers is not None:
+                    await connection.execute(
+                        sql_text("SELECT set_config('max_parallel_maintenance_workers', :value, false)"),
+                        {"value": str(int(self.maintenance_workers))},
+                    )
+
+                self.logger.info(f"START: Creating vector index for collection: {collection_name} "
+                                 f"({records_count} rows)")
+
                 create_idx_sql = sql_text(
-                    f'CREATE INDEX "{index_name}" ON "{collection_name}" '
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" ON "{collection_name}" '
                     f'USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})'
+                    f'{self._index_options_sql(index_type)}'
                 )
-
-                await session.execute(create_idx_sql)
-                await session.commit()
+                await connection.execute(create_idx_sql)
+                self.metadata_cache.set(collection_name, index_valid=True)
 
                 self.logger.info(f"END: Created vector index for collection: {collection_name}")
-                
+            finally:
+                await connection.execute(sql_text("RESET maintenance_work_mem"))
+                await connection.execute(sql_text("RESET max_parallel_maintenance_workers"))
+
         return True
 
     async def reset_vector_index(self, collection_name: str, 
@@ -215,6 +341,8 @@ class PGVectorProvider(VectorDBInterface):
                 drop_sql = sql_text(f'DROP INDEX IF EXISTS "{index_name}"')
                 await session.execute(drop_sql)
                 await session.commit()
+
+        self.metadata_cache.set(collection_name, index_valid=False)
         
         return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
 
@@ -229,7 +357,83 @@ class PGVectorProvider(VectorDBInterface):
             String formatted as "[v1,v2,v3,...]" for pgvector.
         """
         return "[" + ",".join(str(v) for v in vector) + "]"
+
+    def _bind_vector(self, vector: List[float]):
+        """Bind value for a ``:vector`` parameter, matching the connection's codec."""
+        if self.vector_codec:
+            return list(vector)
+        return self._format_vector(vector)
     
+    async def _copy_records(self, session, collection_name: str, texts: List[str],
+                            vectors: List[List[float]], metadata: List[Optional[Dict[str, Any]]],
+                            record_ids: List[Optional[Union[str, int]]]) -> bool:
+        """
+        Stream rows into the collection with ``COPY ... FROM STDIN (FORMAT binary)``.
+
+        Vectors are sent with pgvector's binary encoding (packed float4), so no
+        per-float strings are built on either side. Runs on the session's own
+        asyncpg connection, inside its transaction, relying on the codec
+        registered in ``connect``. Returns False when the driver connection is
+        not asyncpg, so the caller can fall back to INSERT.
+        """
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = getattr(raw_connection, "driver_connection", None)
+        if driver_connection is None or not hasattr(driver_connection, "copy_records_to_table"):
+            return False
+
+        records = (
+            (
+                _text,
+                _vector,
+                json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}",
+                _record_id,
+            )
+            for _text, _vector, _metadata, _record_id in zip(texts, vectors, metadata, record_ids)
+        )
+
+        await driver_connection.copy_records_to_table(
+            collection_name,
+            records=records,
+            columns=[
+                PgVectorTableSchemeEnums.TEXT.value,
+                PgVectorTableSchemeEnums.VECTOR.value,
+                PgVectorTableSchemeEnums.METADATA.value,
+                PgVectorTableSchemeEnums.CHUNK_ID.value,
+            ],
+        )
+        return True
+
+    async def _insert_records(self, session, collection_name: str, texts: List[str],
+                              vectors: List[List[float]], metadata: List[Optional[Dict[str, Any]]],
+                              record_ids: List[Optional[Union[str, int]]], batch_size: int) -> None:
+        """Batched executemany INSERT (vectors bound via ``_bind_vector``)."""
+        batch_insert_sql = sql_text(
+            f'INSERT INTO "{collection_name}" '
+            f'({PgVectorTableSchemeEnums.TEXT.value}, '
+            f'{PgVectorTableSchemeEnums.VECTOR.value}, '
+            f'{PgVectorTableSchemeEnums.METADATA.value}, '
+            f'{PgVectorTableSchemeEnums.CHUNK_ID.value}) '
+            f'VALUES (:text, :vector, :metadata, :chunk_id)'
+        )
+
+        for i in range(0, len(texts), batch_size):
+            values = []
+
+            for _text, _vector, _metadata, _record_id in zip(
+                texts[i:i + batch_size], vectors[i:i + batch_size],
+                metadata[i:i + batch_size], record_ids[i:i + batch_size]
+            ):
+                metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
+                values.append({
+                    'text': _text,
+                    'vector': self._bind_vector(_vector),
+                    'metadata': metadata_json,
+                    'chunk_id': _record_id
+                })
+
+            await session.execute(batch_insert_sql, values)
+
     async def insert_one(self, collection_name: str, text: str, vector: List[float],
                          metadata: Optional[Dict[str, Any]] = None,
                          record_id: Optional[Union[str, int]] = None) -> bool:
@@ -269,7 +473,7 @@ class PGVectorProvider(VectorDBInterface):
                 metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else "{}"
                 await session.execute(insert_sql, {
                     'text': text,
-                    'vector': self._format_vector(vector),
+                    'vector': self._bind_vector(vector),
                     'metadata': metadata_json,
                     'chunk_id': record_id
                 })
@@ -284,9 +488,13 @@ class PGVectorProvider(VectorDBInterface):
                          vectors: List[List[float]], 
                          metadata: Optional[List[Optional[Dict[str, Any]]]] = None,
                          record_ids: Optional[List[Optional[Union[str, int]]]] = None, 
-                         batch_size: int = 50) -> bool:
+                         batch_size: int = 50, create_index: bool = True) -> bool:
         """
-        Insert multiple documents with their embedding vectors in batches.
+        Insert multiple documents with their embedding vectors.
+
+        Rows are streamed with a binary COPY when ``bulk_copy`` is enabled and
+        the pgvector asyncpg codec is available; otherwise they are inserted
+        in batches of ``batch_size``. Throughput is logged in rows per second.
         
         Args:
             collection_name: Target collection name.
@@ -294,7 +502,9 @@ class PGVectorProvider(VectorDBInterface):
             vectors: List of embedding vectors.
             metadata: Optional list of metadata dictionaries (one per document).
             record_ids: Optional list of chunk IDs for foreign key references.
-            batch_size: Number of records to insert per batch.
+            batch_size: Number of records per INSERT batch (fallback path only).
+            create_index: Build the vector index once past the threshold. Bulk
+                loads pass False and call ``create_vector_index`` at the end.
             
         Returns:
             True if all insertions successful, False otherwise.
@@ -321,47 +531,63 @@ class PGVectorProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = [None] * len(texts)
         
+        started_at = time.perf_counter()
+        ingest_mode = "copy"
+
         async with self.db_client() as session:
             async with session.begin():
-                for i in range(0, len(texts), batch_size):
-                    batch_texts = texts[i:i + batch_size]
-                    batch_vectors = vectors[i:i + batch_size]
-                    batch_metadata = metadata[i:i + batch_size]
-                    batch_record_ids = record_ids[i:i + batch_size]
-
-                    values = []
-
-                    for _text, _vector, _metadata, _record_id in zip(
-                        batch_texts, batch_vectors, batch_metadata, batch_record_ids
-                    ):
-                        metadata_json = json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else "{}"
-                        values.append({
-                            'text': _text,
-                            'vector': self._format_vector(_vector),
-                            'metadata': metadata_json,
-                            'chunk_id': _record_id
-                        })
-                    
-                    batch_insert_sql = sql_text(
-                        f'INSERT INTO "{collection_name}" '
-                        f'({PgVectorTableSchemeEnums.TEXT.value}, '
-                        f'{PgVectorTableSchemeEnums.VECTOR.value}, '
-                        f'{PgVectorTableSchemeEnums.METADATA.value}, '
-                        f'{PgVectorTableSchemeEnums.CHUNK_ID.value}) '
-                        f'VALUES (:text, :vector, :metadata, :chunk_id)'
-                    )
-                    
-                    await session.execute(batch_insert_sql, values)
-                
+                copied = False
+                if self.bulk_copy and self.vector_codec:
+                    copied = await self._copy_records(session, collection_name, texts,
+                                                      vectors, metadata, record_ids)
+                if not copied:
+                    ingest_mode = "insert"
+                    await self._insert_records(session, collection_name, texts,
+                                               vectors, metadata, record_ids, batch_size)
+
                 await session.commit()
 
-        await self.create_vector_index(collection_name=collection_name)
+        elapsed = max(time.perf_counter() - started_at, 1e-9)
+        self.logger.info(
+            f"Ingested {len(texts)} rows into {collection_name} via {ingest_mode} "
+            f"in {elapsed:.3f}s ({len(texts) / elapsed:.0f} rows/s)"
+        )
+
+        if create_index:
+            await self.create_vector_index(collection_name=collection_name)
 
         return True
     
+    async def delete_by_record_ids(self, collection_name: str,
+                                   record_ids: List[Union[str, int]]) -> int:
+        """Delete the vectors of the given chunk ids; returns the deleted row count."""
+        if not record_ids or not await self.is_collection_existed(collection_name=collection_name):
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(
+                    f'DELETE FROM "{collection_name}" '
+                    f'WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)'
+                )
+                result = await session.execute(delete_sql, {"record_ids": [int(r) for r in record_ids]})
+                await session.commit()
+
+        return result.rowcount
+
+    async def _apply_search_effort(self, session, search_effort: int) -> None:
+        """Equivalent of SET LOCAL for the running transaction only."""
+        value = str(int(search_effort))
+        await session.execute(
+            sql_text("SELECT set_config('hnsw.ef_search', :value, true), "
+                     "set_config('ivfflat.probes', :value, true)"),
+            {"value": value},
+        )
+
     async def search_by_vector(self, collection_name: str, vector: List[float], 
                                limit: int = 5, 
-                               score_threshold: Optional[float] = None) -> List[RetrievedDocument]:
+                               score_threshold: Optional[float] = None,
+                               search_effort: Optional[int] = None) -> List[RetrievedDocument]:
         """
         Search for similar documents using vector similarity.
         
@@ -372,6 +598,8 @@ class PGVectorProvider(VectorDBInterface):
             vector: Query embedding vector.
             limit: Maximum number of results to return.
             score_threshold: Optional minimum score threshold for filtering results.
+            search_effort: Optional ANN effort for this query, applied as
+                transaction-local ``hnsw.ef_search`` and ``ivfflat.probes``.
             
         Returns:
             List of RetrievedDocument objects with text and similarity score.
@@ -382,41 +610,42 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.error(f"Cannot search for records in a non-existent collection: {collection_name}")
             return []
         
-        formatted_vector = self._format_vector(vector)
+        vector_param = self._bind_vector(vector)
         
         async with self.db_client() as session:
             async with session.begin():
-                # Build search query with optional score threshold
+                if search_effort:
+                    await self._apply_search_effort(session, search_effort)
+
+                # The inner query orders by the raw distance operator with a
+                # LIMIT, which is the only shape the HNSW/IVFFlat index can
+                # serve (ordering by a computed score, or filtering on it,
+                # forces a full distance scan). The score threshold is then
+                # applied to those nearest candidates only.
                 # Using cosine similarity: 1 - cosine_distance
-                base_query = (
-                    f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, '
-                    f'1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score, '
-                    f'{PgVectorTableSchemeEnums.METADATA.value} as metadata '
-                    f'FROM "{collection_name}"'
+                vector_col = PgVectorTableSchemeEnums.VECTOR.value
+                search_sql = (
+                    f'SELECT text, 1 - distance as score, metadata FROM ('
+                        f'SELECT {PgVectorTableSchemeEnums.TEXT.value} as text, '
+                        f'{vector_col} <=> :vector as distance, '
+                        f'{PgVectorTableSchemeEnums.METADATA.value} as metadata '
+                        f'FROM "{collection_name}" '
+                        f'ORDER BY {vector_col} <=> :vector '
+                        f'LIMIT :limit'
+                    f') candidates'
                 )
-                
+                params = {
+                    "vector": vector_param,
+                    "limit": limit
+                }
+
                 if score_threshold is not None:
-                    search_sql = sql_text(
-                        f'{base_query} '
-                        f'WHERE 1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) >= :threshold '
-                        f'ORDER BY score DESC '
-                        f'LIMIT :limit'
-                    )
-                    result = await session.execute(search_sql, {
-                        "vector": formatted_vector,
-                        "threshold": score_threshold,
-                        "limit": limit
-                    })
-                else:
-                    search_sql = sql_text(
-                        f'{base_query} '
-                        f'ORDER BY score DESC '
-                        f'LIMIT :limit'
-                    )
-                    result = await session.execute(search_sql, {
-                        "vector": formatted_vector,
-                        "limit": limit
-                    })
+                    search_sql += ' WHERE 1 - distance >= :threshold'
+                    params["threshold"] = score_threshold
+
+                search_sql += ' ORDER BY distance'
+
+                result = await session.execute(sql_text(search_sql), params)
 
                 records = result.fetchall()
 
@@ -427,4 +656,9 @@ class PGVectorProvider(VectorDBInterface):
                         metadata=record.metadata if record.metadata else {}
                     )
                     for record in records
-                ]
\ No newline at end of file
+                ]
+
+
+def _register_vector_codec(dbapi_connection, connection_record):
+    """Pool ``connect`` hook: install pgvector's binary codec on a new asyncpg connection."""
+    dbapi_connection.run_async(register_vector)
@@ -1,6 +1,7 @@
 from qdrant_client import models, QdrantClient
 from models.db_schemes import RetrievedDocument
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionMetadataCache import CollectionMetadataCache
 from ..VectorDBEnums import DistanceMethodEnums
 import logging
 import uuid
@@ -9,13 +10,15 @@ from typing import List, Optional, Union, Dict, Any
 class QdrantDBProvider(VectorDBInterface):
 
     def __init__(self, db_client: str, default_vector_size: int = 1024,
-                       distance_method: Optional[str] = None, index_threshold: int = 1000):
+                       distance_method: Optional[str] = None, index_threshold: int = 1000,
+                       metadata_cache_ttl: float = 30.0):
    
         self.client: Optional[QdrantClient] = None
         self.db_client = db_client
         self.distance_method: Optional[models.Distance] = None
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
+        self.metadata_cache = CollectionMetadataCache(ttl_seconds=metadata_cache_ttl)
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
@@ -35,6 +38,7 @@ class QdrantDBProvider(VectorDBInterface):
             raise
 
     async def disconnect(self) -> None:
+        self.metadata_cache.clear()
         if self.client is not None:
             try:
                 self.client.close()
@@ -49,7 +53,13 @@ class QdrantDBProvider(VectorDBInterface):
     
     async def is_collection_existed(self, collection_name: str) -> bool:
         self._ensure_client_connected()
-        return self.client.collection_exists(collection_name=collection_name)
+        if self.metadata_cache.get(collection_name, "exists"):
+            return True
+
+        exists = self.client.collection_exists(collection_name=collection_name)
+        if exists:
+            self.metadata_cache.set(collection_name, exists=True)
+        return exists
     
     async def list_all_collections(self) -> List:
         self._ensure_client_connected()
@@ -63,6 +73,7 @@ class QdrantDBProvider(VectorDBInterface):
         self._ensure_client_connected()
         if await self.is_collection_existed(collection_name):
             self.logger.info(f"Deleting Qdrant collection: {collection_name}")
+            self.metadata_cache.invalidate(collection_name)
             return self.client.delete_collection(collection_name=collection_name)
         
     async def create_collection(self, collection_name: str, 
@@ -82,6 +93,7 @@ class QdrantDBProvider(VectorDBInterface):
                     distance=self.distance_method
                 )
             )
+            self.metadata_cache.set(collection_name, exists=True, embedding_size=embedding_size)
 
             return True
         
@@ -139,7 +151,7 @@ class QdrantDBProvider(VectorDBInterface):
     async def insert_many(self, collection_name: str, texts: List[str], 
                           vectors: List[List[float]], metadata: Optional[List[Optional[Dict[str, Any]]]] = None, 
                           record_ids: Optional[List[Optional[Union[str, int]]]] = None, 
-                          batch_size: int = 50) -> bool:
+                          batch_size: int = 50, create_index: bool = True) -> bool:
         
         self._ensure_client_connected()
         
@@ -206,8 +218,25 @@ class QdrantDBProvider(VectorDBInterface):
         return True
         
 
+    async def delete_by_record_ids(self, collection_name: str,
+                                   record_ids: List[Union[str, int]]) -> int:
+        self._ensure_client_connected()
+        if not record_ids or not await self.is_collection_existed(collection_name):
+            return 0
+
+        self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=list(record_ids)),
+        )
+        return len(record_ids)
+
+    async def create_vector_index(self, collection_name: str) -> bool:
+        # Qdrant builds its HNSW graph in the background optimizer.
+        return False
+
     async def search_by_vector(self, collection_name: str, vector: List[float], 
-                               limit: int = 5, score_threshold: Optional[float] = None) -> List[RetrievedDocument]:
+                               limit: int = 5, score_threshold: Optional[float] = None,
+                               search_effort: Optional[int] = None) -> List[RetrievedDocument]:
         self._ensure_client_connected()
         
         if not await self.is_collection_existed(collection_name):
@@ -228,6 +257,7 @@ class QdrantDBProvider(VectorDBInterface):
                 query=vector,                 
                 limit=limit,
                 score_threshold=score_threshold,
+                search_params=models.SearchParams(hnsw_ef=search_effort) if search_effort else None,
                 with_payload=True,           
                 with_vectors=False          
             )
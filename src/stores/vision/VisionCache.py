@@ -0,0 +1,220 @@
+"""
+Content-addressed cache for vision results.
+
+The same logo, diagram or scanned page is typically sent to the vision
+provider on every page it appears on and again on every re-process of the
+project. :class:`CachedVisionProvider` wraps a real provider and answers
+repeated requests from a persistent SQLite store keyed by the SHA-256 of the
+(already optimized) image payload plus the prompt, provider and model.
+
+The store lives on the local filesystem (``assets/database`` by default), so
+it is shared by every worker process on the host and survives restarts. It is
+bounded by total stored text size and evicts least-recently-used entries.
+Like the rest of the vision layer, cache failures never raise: any SQLite
+error degrades to a cache miss and the real provider is called.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from .VisionInterface import VisionInterface, VisionResult
+
+logger = logging.getLogger(__name__)
+
+
+class VisionResultCache:
+    """SQLite-backed LRU store of vision result texts."""
+
+    # Fraction of ``max_bytes`` kept after an eviction pass, so eviction does
+    # not run again on every following insert.
+    _EVICT_TO_RATIO = 0.9
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection per operation (safe across threads/processes)."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:  # commit on success, roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS vision_results ("
+                "cache_key TEXT PRIMARY KEY, "
+                "text TEXT NOT NULL, "
+                "provider TEXT NOT NULL, "
+                "model TEXT, "
+                "size_bytes INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "last_used_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_vision_results_last_used "
+                "ON vision_results (last_used_at)"
+            )
+
+    @staticmethod
+    def make_key(kind: str, image_bytes: bytes, prompt: str | None,
+                 provider: str, model: str | None) -> str:
+        digest = hashlib.sha256()
+        for part in (kind, prompt or "", provider, model or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[str, str, str | None] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, provider, model FROM vision_results WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE vision_results SET last_used_at = ? WHERE cache_key = ?",
+                    (time.time(), key),
+                )
+        return row
+
+    def put(self, key: str, text: str, provider: str, model: str | None) -> None:
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO vision_results "
+                "(cache_key, text, provider, model, size_bytes, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, text, provider, model, size, now, now),
+            )
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM vision_results"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total)
+
+    def _evict(self, conn: sqlite3.Connection, total: int) -> None:
+        """Drop least-recently-used rows until under the eviction target."""
+        target = int(self.max_bytes * self._EVICT_TO_RATIO)
+        rows = conn.execute(
+            "SELECT cache_key, size_bytes FROM vision_results ORDER BY last_used_at ASC"
+        ).fetchall()
+        doomed = []
+        for cache_key, size_bytes in rows:
+            if total <= target:
+                break
+            doomed.append((cache_key,))
+            total -= size_bytes
+        conn.executemany("DELETE FROM vision_results WHERE cache_key = ?", doomed)
+        logger.info("Vision cache evicted %d entries (LRU).", len(doomed))
+
+
+class CachedVisionProvider(VisionInterface):
+    """
+    Read-through cache in front of a real :class:`VisionInterface`.
+
+    Only successful results are stored. Concurrent identical requests (the
+    same image dispatched from several pages at once) are collapsed onto a
+    single provider call. ``hits`` / ``misses`` count lookups for this
+    process; see :meth:`stats`.
+    """
+
+    def __init__(self, provider: VisionInterface, cache: VisionResultCache):
+        self.provider = provider
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self._guard = threading.Lock()
+        self._inflight: dict[str, threading.Lock] = {}
+
+    def __getattr__(self, name):
+        # Expose provider attributes (provider_name, model_id, ...) unchanged.
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    def is_configured(self) -> bool:
+        return self.provider.is_configured()
+
+    def set_vision_model(self, model_id: str | None = None) -> None:
+        self.provider.set_vision_model(model_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def describe_image(self, image_bytes: bytes, mime_type: str = "image/jpeg",
+                       prompt: str | None = None,
+                       metadata: dict[str, Any] | None = None) -> VisionResult | None:
+        return self._cached("image", self.provider.describe_image,
+                            image_bytes, mime_type, prompt, metadata)
+
+    def describe_page(self, image_bytes: bytes, mime_type: str = "image/jpeg",
+                      prompt: str | None = None,
+                      metadata: dict[str, Any] | None = None) -> VisionResult | None:
+        return self._cached("page", self.provider.describe_page,
+                            image_bytes, mime_type, prompt, metadata)
+
+    def _cached(self, kind: str, call, image_bytes: bytes, mime_type: str,
+                prompt: str | None, metadata: dict[str, Any] | None) -> VisionResult | None:
+        if image_bytes is None:
+            return call(image_bytes=image_bytes, mime_type=mime_type,
+                        prompt=prompt, metadata=metadata)
+
+        provider_name = getattr(self.provider, "provider_name", type(self.provider).__name__)
+        model_id = getattr(self.provider, "model_id", None)
+        key = VisionResultCache.make_key(kind, image_bytes, prompt,
+                                         provider_name, model_id)
+
+        with self._guard:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                try:
+                    row = self.cache.get(key)
+                except sqlite3.Error as e:
+                    logger.debug("Vision cache lookup failed: %s", e)
+                    row = None
+
+                if row is not None:
+                    with self._guard:
+                        self.hits += 1
+                    text, provider, model = row
+                    return VisionResult(text=text, provider=provider, model=model,
+                                        metadata={**(metadata or {}), "cache_hit": True})
+
+                with self._guard:
+                    self.misses += 1
+                result = call(image_bytes=image_bytes, mime_type=mime_type,
+                              prompt=prompt, metadata=metadata)
+                if result is not None and result.text:
+                    try:
+                        self.cache.put(key, result.text, result.provider, result.model)
+                    except sqlite3.Error as e:
+                        logger.debug("Vision cache store failed: %s", e)
+                return result
+        finally:
+            with self._guard:
+                # A later caller may already have installed its own lock.
+                if self._inflight.get(key) is key_lock:
+                    del self._inflight[key]
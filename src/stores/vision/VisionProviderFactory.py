@@ -1,4 +1,5 @@
 import logging
+import os
 
 from .VisionEnums import VisionEnums, DEFAULT_VISION_MODELS
 from .VisionInterface import VisionInterface, NullVisionProvider
@@ -43,6 +44,27 @@ class VisionProviderFactory:
             "max_image_bytes": getattr(self.config, "VISION_MAX_IMAGE_BYTES", 4_000_000),
         }
 
+    def _with_cache(self, client: VisionInterface) -> VisionInterface:
+        """Wrap ``client`` in the persistent result cache when enabled."""
+        if not getattr(self.config, "VISION_CACHE_ENABLED", False):
+            return client
+        try:
+            from .VisionCache import VisionResultCache, CachedVisionProvider
+
+            path = getattr(self.config, "VISION_CACHE_PATH", None)
+            if not path:
+                from controllers.BaseController import basecontroller
+                path = os.path.join(
+                    basecontroller().get_database_path(db_name="vision_cache"),
+                    "vision_cache.sqlite3",
+                )
+            max_mb = getattr(self.config, "VISION_CACHE_MAX_MB", 256)
+            cache = VisionResultCache(path=path, max_bytes=int(max_mb * 1024 * 1024))
+        except Exception as e:  # noqa: BLE001 - the cache is an optimization only
+            logger.warning("Vision result cache unavailable (%s); calling provider directly.", e)
+            return client
+        return CachedVisionProvider(client, cache)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -110,4 +132,4 @@ class VisionProviderFactory:
             return NullVisionProvider(reason=f"{provider} not configured")
 
         logger.info("Vision provider '%s' active (model=%s).", provider, model_id)
-        return client
+        return self._with_cache(client)
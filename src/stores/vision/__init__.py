@@ -1,6 +1,7 @@
 from .VisionProviderFactory import VisionProviderFactory
 from .VisionInterface import VisionInterface, VisionResult, NullVisionProvider
 from .VisionEnums import VisionEnums, VisionContentType
+from .VisionCache import VisionResultCache, CachedVisionProvider
 
 __all__ = [
     "VisionProviderFactory",
@@ -9,4 +10,6 @@ __all__ = [
     "NullVisionProvider",
     "VisionEnums",
     "VisionContentType",
+    "VisionResultCache",
+    "CachedVisionProvider",
 ]
@@ -1,10 +1,12 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_worker_setup_utils, release_setup_utils, run_in_worker_loop
 from helpers.config import get_config
 import asyncio
 import uuid
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
+from models.EmbeddingCacheModel import EmbeddingCacheModel
 from controllers import NLPController
+from stores.vectordb import RetrievalCache
 from tqdm.auto import tqdm
 from models import responsesignal
 from utils.idempotency_manager import IdempotencyManager
@@ -18,16 +20,25 @@ logger = logging.getLogger(__name__)
     autoretry_for=(Exception,),
     retry_kwargs={'max_retries': 3, 'countdown': 60}
 )
-def index_data_content(self, project_id: int, do_reset: int, total_chunks_count: int):
-    return asyncio.run(
-        _index_data_content(self, project_id, do_reset, total_chunks_count)
+def index_data_content(self, project_id: int, do_reset: int, total_chunks_count: int,
+                       chunks_state_version: int = 0):
+    return run_in_worker_loop(
+        _index_data_content(self, project_id, do_reset, total_chunks_count, chunks_state_version)
     )
 
-async def _index_data_content(task_instance, project_id: int, do_reset: int, total_chunks_count: int):
+async def _next_chunk_batch(chunk_batches):
+    try:
+        return await chunk_batches.__anext__()
+    except StopAsyncIteration:
+        return None
+
+async def _index_data_content(task_instance, project_id: int, do_reset: int, total_chunks_count: int,
+                              chunks_state_version: int = 0):
     
     db_engine, vectordb_client = None, None
     idempotency_manager = None
     task_record = None 
+    retrieval_cache = None
     settings = get_config()
 
     try:
@@ -35,7 +46,7 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, tot
         vectordb_provider_factory,
         generation_client, embedding_client,
         vectordb_client, template_parser,
-        _vision_client) = await get_setup_utils()
+        _vision_client) = await get_worker_setup_utils()
 
         
         idempotency_manager = IdempotencyManager(db_client, db_engine)
@@ -43,7 +54,8 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, tot
         task_args = {
             "project_id": project_id,
             "do_reset": do_reset,
-            "total_chunks_count": total_chunks_count
+            "total_chunks_count": total_chunks_count,
+            "chunks_state_version": chunks_state_version
         }
         
         task_name = "tasks.data_indexing.index_data_content"
@@ -96,61 +108,104 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, tot
 
             raise Exception(f"No project found for project_id: {project_id}")
         
+        embedding_cache = None
+        if settings.EMBEDDING_CACHE_ENABLED:
+            embedding_cache = await EmbeddingCacheModel.create_instance(db_client=db_client)
+
+        retrieval_cache = RetrievalCache.from_config(settings)
+
         nlp_controller = NLPController(
             vectordb_client=vectordb_client,
             generation_client=generation_client,
             template_parser=template_parser,
             embedding_client=embedding_client,
+            embedding_cache=embedding_cache,
+            retrieval_cache=retrieval_cache,
         )
 
-        has_records = True
-        page_no = 1
         inserted_items_count = 0
 
         collection_name = nlp_controller.create_collection_name(project_id=project.id)
 
-        _ = await vectordb_client.create_collection(
+        is_new_collection = await vectordb_client.create_collection(
                 collection_name=collection_name,
                 embedding_size=settings.EMBEDDING_MODEL_SIZE,
                 do_reset=do_reset,
             )
 
-        total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.id)
+        # A fresh collection holds no vectors: every chunk needs indexing again.
+        if is_new_collection:
+            _ = await chunk_model.reset_project_chunks_indexed(db_project_id=project.id)
+
+        # Only chunks not yet in the collection are streamed and embedded.
+        total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.id,
+                                                                      only_unindexed=True)
         pbar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
         logger.info(f"Vector Indexing progress: {inserted_items_count}/{total_chunks_count}")
 
-        while has_records:
-            page_chunks = await chunk_model.get_project_chunks(db_project_id=project.id, page_no=page_no)
-            
-            if len(page_chunks):
-                page_no += 1
-            
-            if not page_chunks or len(page_chunks) == 0:
-                has_records = False
-                break
-
-            chunks_ids = [c.chunk_id for c in page_chunks]
-
-            is_inserted = await nlp_controller.index_into_vector_db(
-                project=project,
-                chunks=page_chunks,
-                chunks_ids=chunks_ids
-            )
+        # Read enough chunks per page to keep every concurrent embedding
+        # batch busy (see NLPController.embed_documents).
+        page_size = settings.EMBEDDING_BATCH_SIZE * max(1, settings.EMBEDDING_MAX_CONCURRENCY)
 
-            if not is_inserted:
-                error_signal = responsesignal.INSERT_INTO_VECTORDB_ERROR.value
-                
-                await idempotency_manager.update_task_status(
-                    execution_id=task_record.execution_id,
-                    status='FAILURE',
-                    result={"signal": error_signal}
+        # Bulk-load mode: no index maintenance per page; the index is built
+        # once, concurrently, after the last page (see build_vector_index).
+        defer_index = settings.VECTOR_DB_PGVEC_DEFER_INDEX
+
+        chunk_batches = chunk_model.iter_project_chunks(db_project_id=project.id,
+                                                        page_size=page_size,
+                                                        only_unindexed=True)
+        # Keep one page read in flight so the next batch is fetched from
+        # Postgres while the current one is being embedded and upserted.
+        next_batch = asyncio.create_task(_next_chunk_batch(chunk_batches))
+
+        try:
+            while True:
+                page_chunks = await next_batch
+                if not page_chunks:
+                    break
+
+                next_batch = asyncio.create_task(_next_chunk_batch(chunk_batches))
+
+                chunks_ids = [c.chunk_id for c in page_chunks]
+
+                is_inserted = await nlp_controller.index_into_vector_db(
+                    project=project,
+                    chunks=page_chunks,
+                    chunks_ids=chunks_ids,
+                    create_index=not defer_index,
+                    replace_existing=not is_new_collection,
                 )
 
-                raise Exception(f"can not insert into vectorDB | project_id: {project_id}")
-            
-            pbar.update(len(page_chunks))
-            inserted_items_count += len(page_chunks)
-            
+                if not is_inserted:
+                    error_signal = responsesignal.INSERT_INTO_VECTORDB_ERROR.value
+
+                    await idempotency_manager.update_task_status(
+                        execution_id=task_record.execution_id,
+                        status='FAILURE',
+                        result={"signal": error_signal}
+                    )
+
+                    raise Exception(f"can not insert into vectorDB | project_id: {project_id}")
+
+                _ = await chunk_model.mark_chunks_indexed(chunk_ids=chunks_ids)
+
+                pbar.update(len(page_chunks))
+                inserted_items_count += len(page_chunks)
+        finally:
+            if not next_batch.done():
+                next_batch.cancel()
+                try:
+                    await next_batch
+                except (asyncio.CancelledError, Exception):
+                    pass
+            await chunk_batches.aclose()
+            # Vectors changed (even on a partial run): drop cached search results.
+            if is_new_collection or inserted_items_count:
+                await nlp_controller.bump_index_version(project=project)
+
+        if defer_index:
+            await nlp_controller.build_vector_index(project=project)
+
         success_result = {
             "signal": responsesignal.INSERT_INTO_VECTORDB_SUCCESS.value,
             "inserted_items_count": inserted_items_count
@@ -181,10 +236,8 @@ async def _index_data_content(task_instance, project_id: int, do_reset: int, tot
         
     finally:
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            if retrieval_cache is not None:
+                await retrieval_cache.close()
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
             logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
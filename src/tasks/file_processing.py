@@ -1,6 +1,5 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_worker_setup_utils, release_setup_utils, run_in_worker_loop
 from helpers.config import get_config
-import asyncio
 import uuid
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
@@ -9,7 +8,9 @@ from models.db_schemes import DataChunk
 from models.enums.ResponseSignal import responsesignal
 from models.enums.AssetTypeEnum import AssetTypeEnum
 from controllers import processcontroller, NLPController
+from stores.vectordb import RetrievalCache
 from utils.idempotency_manager import IdempotencyManager
+from utils.ingestion_profiler import cprofile_to_dir
 
 import logging
 logger = logging.getLogger(__name__)
@@ -24,10 +25,12 @@ def process_project_files(self, project_id: int,
                           overlap_size: int, do_reset: int,
                           files_state_version: int = 0):
 
-    return asyncio.run(
-        _process_project_files(self, project_id, file_id, chunk_size,
-                               overlap_size, do_reset, files_state_version)
-    )
+    with cprofile_to_dir(get_config().INGESTION_PROFILE_DIR,
+                         f"process_project_files-{self.request.id}"):
+        return run_in_worker_loop(
+            _process_project_files(self, project_id, file_id, chunk_size,
+                                   overlap_size, do_reset, files_state_version)
+        )
 
 async def _process_project_files(task_instance, project_id: int, 
                                  file_id: int, chunk_size: int,
@@ -38,6 +41,7 @@ async def _process_project_files(task_instance, project_id: int,
     db_engine, vectordb_client = None, None
     idempotency_manager = None 
     task_record = None
+    retrieval_cache = None
     
     try:
 
@@ -45,7 +49,7 @@ async def _process_project_files(task_instance, project_id: int,
         vectordb_provider_factory,
         generation_client, embedding_client,
         vectordb_client, template_parser,
-        vision_client) = await get_setup_utils()
+        vision_client) = await get_worker_setup_utils()
 
         
         # Create idempotency manager
@@ -107,23 +111,20 @@ async def _process_project_files(task_instance, project_id: int,
             db_client=db_client
         )
     
+        retrieval_cache = RetrievalCache.from_config(settings)
     
         nlp_controller = NLPController(
             vectordb_client=vectordb_client,
             generation_client=generation_client,
             template_parser=template_parser,
             embedding_client=embedding_client,
+            retrieval_cache=retrieval_cache,
         )
         
-        project_files_ids = {}
-        
         if file_id:
-            asset_record = await asset_model.get_asset_by_id(
-                asset_id=file_id,
-                asset_project_id=project.id
-            )
-                
-            if asset_record is None:
+            project_files_ids = await get_project_files(asset_model, project, file_id)
+
+            if not project_files_ids:
                 error_signal = responsesignal.FILE_ID_ERROR.value
                 
                 # Update task status to FAILURE
@@ -134,35 +135,8 @@ async def _process_project_files(task_instance, project_id: int,
                 )
                 
                 raise Exception(f"No assets for file_id: {file_id}")
-
-            project_files_ids = {
-                asset_record.asset_id: asset_record.asset_name
-            }
-        
-        
         else:
-            
-            project_files = await asset_model.get_all_project_assets(
-            asset_project_id=project.id,
-            asset_type=AssetTypeEnum.FILE.value,
-                                            )
-
-            # Also include URL-type assets (stored as .txt files on disk)
-            project_url_assets = await asset_model.get_all_project_assets(
-                asset_project_id=project.id,
-                asset_type=AssetTypeEnum.URL.value,
-            )
-
-            # Include structured-data assets (CSV / Excel files)
-            project_structured_assets = await asset_model.get_all_project_assets(
-                asset_project_id=project.id,
-                asset_type=AssetTypeEnum.STRUCTURED_DATA.value,
-            )
-
-            project_files_ids = {
-                record.asset_id: record.asset_name
-                for record in list(project_files) + list(project_url_assets) + list(project_structured_assets)
-            }
+            project_files_ids = await get_project_files(asset_model, project)
 
         if len(project_files_ids) == 0:
             error_signal = responsesignal.NO_FILES_ERROR.value
@@ -181,61 +155,57 @@ async def _process_project_files(task_instance, project_id: int,
 
         no_records = 0
         no_files = 0
+        no_skipped = 0
 
         chunk_model = await ChunkModel.create_instance(
                             db_client=db_client
                         )
 
         if do_reset == 1:
-            # delete associated vectors collection
-            collection_name = nlp_controller.create_collection_name(project_id=project.id)
-            _ = await vectordb_client.delete_collection(collection_name=collection_name)
+            # delete associated vectors collection (and invalidate cached searches)
+            _ = await nlp_controller.reset_vector_db_collection(project=project)
 
             # delete associated chunks
             _ = await chunk_model.delete_chunks_by_db_project_id(
                 db_project_id=project.id
             )
 
-        for asset_id, file_id in project_files_ids.items():
-
-            file_content = process_controller.get_file_content(file_id=file_id)
+        collection_name = nlp_controller.create_collection_name(project_id=project.id)
 
-            if file_content is None:
-                logger.error(f"Error while processing file: {file_id}")
-                continue
+        for asset in project_files_ids.values():
 
-            file_chunks = process_controller.get_file_chunks(
-                file_content=file_content,
-                file_id=file_id,
+            inserted_chunks, file_status = await _process_asset_file(
+                process_controller=process_controller,
+                chunk_model=chunk_model,
+                asset_model=asset_model,
+                vectordb_client=vectordb_client,
+                collection_name=collection_name,
+                project=project,
+                asset=asset,
                 chunk_size=chunk_size,
-                overlap_size=overlap_size
+                overlap_size=overlap_size,
+                incremental=do_reset != 1,
             )
 
-            if file_chunks is None or len(file_chunks) == 0:
-                 logger.error(f"No chunks for file_id: {file_id}")
-                 continue
-
-            file_chunks_records = [
-                DataChunk(
-                    chunk_text=chunk.page_content,
-                    chunk_metadata=chunk.metadata,
-                    chunk_order=i+1,
-                    chunk_project_id=project.id,
-                    chunk_asset_id=asset_id
-                )
-                for i, chunk in enumerate(file_chunks)
-            ]
+            if file_status == "unchanged":
+                no_skipped += 1
+            elif file_status == "processed":
+                no_records += inserted_chunks
+                no_files += 1
 
-            no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-            no_files += 1
+        # Changed assets had their old vectors deleted: drop cached searches.
+        if no_skipped < len(project_files_ids):
+            await nlp_controller.bump_index_version(project=project)
 
         success_result = {
                     "signal": responsesignal.PROCESSING_SUCCESS.value,
                     "inserted_chunks": no_records,
                     "processed_files": no_files,
+                    "skipped_files": no_skipped,
                     "project_id": project.project_id,
                     "do_reset": do_reset,
-                    "_db_id": project.id
+                    "_db_id": project.id,
+                    "profile": process_controller.profiler.summary(),
                 }
         
         await idempotency_manager.update_task_status(
@@ -263,10 +233,339 @@ async def _process_project_files(task_instance, project_id: int,
         raise
     finally:
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            if retrieval_cache is not None:
+                await retrieval_cache.close()
+            await release_setup_utils(db_engine, vectordb_client)
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+
+async def get_project_files(asset_model: AssetModel, project, file_id: int = None) -> dict:
+    """
+    ``{asset_id: asset}`` for one asset, or for every processable asset of
+    the project (files, ingested URLs and structured-data files).
+    """
+    if file_id:
+        asset_record = await asset_model.get_asset_by_id(
+            asset_id=file_id,
+            asset_project_id=project.id
+        )
+        if asset_record is None:
+            return {}
+        return {asset_record.asset_id: asset_record}
+
+    project_files = await asset_model.get_all_project_assets(
+        asset_project_id=project.id,
+        asset_type=AssetTypeEnum.FILE.value,
+    )
+
+    # Also include URL-type assets (stored as .txt files on disk)
+    project_url_assets = await asset_model.get_all_project_assets(
+        asset_project_id=project.id,
+        asset_type=AssetTypeEnum.URL.value,
+    )
+
+    # Include structured-data assets (CSV / Excel files)
+    project_structured_assets = await asset_model.get_all_project_assets(
+        asset_project_id=project.id,
+        asset_type=AssetTypeEnum.STRUCTURED_DATA.value,
+    )
+
+    return {
+        record.asset_id: record
+        for record in list(project_files) + list(project_url_assets) + list(project_structured_assets)
+    }
+
+
+FINGERPRINT_CONFIG_KEY = "processing_fingerprint"
+
+async def _process_asset_file(process_controller, chunk_model: ChunkModel, asset_model: AssetModel,
+                              vectordb_client, collection_name: str, project, asset,
+                              chunk_size: int, overlap_size: int, incremental: bool = True):
+    """
+    Parse, chunk and store one asset.
+
+    With ``incremental`` set, an asset whose fingerprint (file bytes, chunk
+    settings, parser version) matches the one stored in ``asset_config`` is
+    skipped. A changed asset has its old vectors and chunks replaced. The
+    stored fingerprint is cleared before old data is touched and written only
+    after the new chunks are in, so an interrupted run is redone next time.
+
+    Returns ``(inserted_chunks, status)`` with status "processed", "unchanged"
+    or "failed". Stage timings are recorded on ``process_controller.profiler``.
+    """
+    profiler = process_controller.profiler
+    file_path = process_controller.get_file_path(file_id=asset.asset_name)
+
+    with profiler.file(asset.asset_name, file_path) as file_profile:
+        inserted_chunks, status = await _store_asset_file(
+            process_controller, chunk_model, asset_model, vectordb_client,
+            collection_name, project, asset, chunk_size, overlap_size, incremental,
+        )
+        file_profile["status"] = status
+
+    return inserted_chunks, status
+
+async def _store_asset_file(process_controller, chunk_model: ChunkModel, asset_model: AssetModel,
+                            vectordb_client, collection_name: str, project, asset,
+                            chunk_size: int, overlap_size: int, incremental: bool):
+    """Body of :func:`_process_asset_file`, run inside its profiler record."""
+    profiler = process_controller.profiler
+    file_name = asset.asset_name
+    asset_config = dict(asset.asset_config or {})
+
+    with profiler.stage("fingerprint"):
+        fingerprint = process_controller.get_file_fingerprint(
+            file_id=file_name, chunk_size=chunk_size, overlap_size=overlap_size
+        )
+
+    if fingerprint is None:
+        logger.error(f"Error while processing file: {file_name}")
+        return 0, "failed"
+
+    if incremental and asset_config.get(FINGERPRINT_CONFIG_KEY) == fingerprint:
+        logger.info(f"Skipping unchanged file: {file_name}")
+        return 0, "unchanged"
+
+    if FINGERPRINT_CONFIG_KEY in asset_config:
+        asset_config.pop(FINGERPRINT_CONFIG_KEY)
+        await asset_model.update_asset_config(asset_id=asset.asset_id, asset_config=asset_config)
+
+    # Replace this asset's previous chunks (vectors first: they reference chunks)
+    with profiler.stage("delete_old_chunks"):
+        old_chunk_ids = await chunk_model.get_asset_chunk_ids(asset_id=asset.asset_id)
+        if old_chunk_ids:
+            _ = await vectordb_client.delete_by_record_ids(collection_name=collection_name,
+                                                           record_ids=old_chunk_ids)
+            _ = await chunk_model.delete_chunks_by_asset_id(asset_id=asset.asset_id)
+
+    # "load" covers eager loaders here plus lazy ones while chunks are pulled
+    # below; "chunking" is recorded inside it by the controller.
+    with profiler.stage("load"):
+        file_content = process_controller.iter_file_content(file_id=file_name)
+
+    if file_content is None:
+        logger.error(f"Error while processing file: {file_name}")
+        return 0, "failed"
+
+    file_chunks = process_controller.iter_file_chunks(
+        file_content=file_content,
+        file_id=file_name,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size
+    )
+
+    # Chunks are streamed from the loader and flushed in bounded batches, so
+    # memory stays flat regardless of file size.
+    insert_batch_size = get_config().CHUNK_INSERT_BATCH_SIZE
+    inserted_chunks = 0
+    file_chunks_records = []
+
+    for i, chunk in enumerate(profiler.timed_iter("load", file_chunks)):
+        file_chunks_records.append(
+            DataChunk(
+                chunk_text=chunk.page_content,
+                chunk_metadata=chunk.metadata,
+                chunk_order=i+1,
+                chunk_project_id=project.id,
+                chunk_asset_id=asset.asset_id
+            )
+        )
+
+        if len(file_chunks_records) >= insert_batch_size:
+            with profiler.stage("db_insert"):
+                inserted_chunks += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+            file_chunks_records = []
+
+    if file_chunks_records:
+        with profiler.stage("db_insert"):
+            inserted_chunks += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+
+    profiler.count("chunks", inserted_chunks)
+
+    if inserted_chunks == 0:
+        logger.error(f"No chunks for file_id: {file_name}")
+        return 0, "failed"
+
+    asset_config[FINGERPRINT_CONFIG_KEY] = fingerprint
+    await asset_model.update_asset_config(asset_id=asset.asset_id, asset_config=asset_config)
+
+    return inserted_chunks, "processed"
+
+
+@celery_app.task(
+    bind=True, name="tasks.file_processing.process_project_file",
+    max_retries=3, default_retry_delay=60
+)
+def process_project_file(self, project_id: int, asset_id: int,
+                         chunk_size: int, overlap_size: int,
+                         files_state_version: int = 0, do_reset: int = 0,
+                         reset_token: str = None):
+    """
+    Process a single asset; one header task of the per-file chord.
+
+    Retries on its own. Once retries are exhausted it returns a failure
+    result instead of raising, so one bad file neither fails the chord nor
+    re-runs the rest of the project.
+
+    ``reset_token`` identifies the project reset the workflow applied before
+    the fan-out. It is part of the idempotency key, so files are processed
+    again after every reset instead of returning a result recorded before
+    their chunks were deleted.
+    """
+    try:
+        with cprofile_to_dir(get_config().INGESTION_PROFILE_DIR,
+                             f"process_project_file-{self.request.id}"):
+            return run_in_worker_loop(
+                _process_project_file(self, project_id, asset_id, chunk_size,
+                                      overlap_size, files_state_version, do_reset,
+                                      reset_token)
+            )
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+
+        logger.error(f"Giving up on asset {asset_id} after {self.request.retries} retries: {str(e)}")
+        return {
+            "asset_id": asset_id,
+            "inserted_chunks": 0,
+            "status": "failed",
+            "error": str(e),
+        }
+
+async def _process_project_file(task_instance, project_id: int, asset_id: int,
+                                chunk_size: int, overlap_size: int,
+                                files_state_version: int, do_reset: int,
+                                reset_token: str = None):
+
+    db_engine, vectordb_client = None, None
+    idempotency_manager = None
+    task_record = None
+    retrieval_cache = None
+
+    try:
+
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser,
+        vision_client) = await get_worker_setup_utils()
+
+        idempotency_manager = IdempotencyManager(db_client, db_engine)
+
+        task_args = {
+            "project_id": project_id,
+            "asset_id": asset_id,
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+            "files_state_version": files_state_version,
+            "do_reset": do_reset
+        }
+        if reset_token is not None:
+            task_args["reset_token"] = reset_token
+
+        task_name = "tasks.file_processing.process_project_file"
+
+        settings = get_config()
+
+        should_execute, existing_task = await idempotency_manager.should_execute_task(
+            task_name=task_name,
+            task_args=task_args,
+            task_time_limit=settings.CELERY_TASK_TIME_LIMIT
+        )
+
+        if not should_execute:
+            logger.warning(f"Can not handle the task | status: {existing_task.status}")
+            return existing_task.result
+
+        if existing_task:
+            await idempotency_manager.update_task_status(
+                execution_id=existing_task.execution_id,
+                status='PENDING'
+            )
+            task_record = existing_task
+        else:
+            task_record = await idempotency_manager.create_task_record(
+                task_name=task_name,
+                task_args=task_args,
+                celery_task_id = uuid.UUID(task_instance.request.id) if task_instance.request.id else None
+            )
+
+        await idempotency_manager.update_task_status(
+            execution_id=task_record.execution_id,
+            status='STARTED'
+        )
+
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        project = await project_model.get_project_by_id(project_id=project_id)
+
+        asset_model = await AssetModel.create_instance(db_client=db_client)
+        project_files_ids = await get_project_files(asset_model, project, asset_id)
+
+        if not project_files_ids:
+            raise Exception(f"No assets for file_id: {asset_id}")
+
+        process_controller = processcontroller(project_id=project_id, vision_client=vision_client)
+        chunk_model = await ChunkModel.create_instance(db_client=db_client)
+        retrieval_cache = RetrievalCache.from_config(settings)
+
+        nlp_controller = NLPController(
+            vectordb_client=vectordb_client,
+            generation_client=generation_client,
+            template_parser=template_parser,
+            embedding_client=embedding_client,
+            retrieval_cache=retrieval_cache,
+        )
+
+        inserted_chunks, file_status = await _process_asset_file(
+            process_controller=process_controller,
+            chunk_model=chunk_model,
+            asset_model=asset_model,
+            vectordb_client=vectordb_client,
+            collection_name=nlp_controller.create_collection_name(project_id=project.id),
+            project=project,
+            asset=project_files_ids[asset_id],
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            incremental=do_reset != 1,
+        )
+
+        if file_status != "unchanged":
+            await nlp_controller.bump_index_version(project=project)
+
+        result = {
+            "asset_id": asset_id,
+            "inserted_chunks": inserted_chunks,
+            "status": file_status,
+            "profile": process_controller.profiler.summary(),
+        }
+
+        await idempotency_manager.update_task_status(
+            execution_id=task_record.execution_id,
+            status='SUCCESS',
+            result=result
+        )
+
+        return result
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+
+        if idempotency_manager and task_record:
+            try:
+                await idempotency_manager.update_task_status(
+                    execution_id=task_record.execution_id,
+                    status='FAILURE',
+                    result={"error": str(e)}
+                )
+            except Exception as update_error:
+                logger.error(f"Failed to update idempotency status: {update_error}")
+
+        raise
+    finally:
+        try:
+            if retrieval_cache is not None:
+                await retrieval_cache.close()
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
-            logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
+            logger.error(f"Task failed while cleaning: {str(e)}")
@@ -1,7 +1,7 @@
-from celery_app import celery_app, get_setup_utils
+from celery_app import celery_app, get_worker_setup_utils, release_setup_utils, run_in_worker_loop
 from helpers.config import get_config
-import asyncio
 from utils.idempotency_manager import IdempotencyManager
+from models.EmbeddingCacheModel import EmbeddingCacheModel
 
 import logging
 logger = logging.getLogger(__name__)
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
                 )
 def clean_celery_executions_table(self):
 
-    return asyncio.run(
+    return run_in_worker_loop(
         _clean_celery_executions_table(self)
     )
 
@@ -27,7 +27,7 @@ async def _clean_celery_executions_table(task_instance):
         vectordb_provider_factory,
         generation_client, embedding_client,
         vectordb_client, template_parser,
-        _vision_client) = await get_setup_utils()
+        _vision_client) = await get_worker_setup_utils()
 
 
         # Create idempotency manager
@@ -43,10 +43,52 @@ async def _clean_celery_executions_table(task_instance):
         raise
     finally:
         try:
-            if db_engine:
-                await db_engine.dispose()
-            
-            if vectordb_client:
-                await vectordb_client.disconnect()
+            await release_setup_utils(db_engine, vectordb_client)
         except Exception as e:
-            logger.error(f"Task failed while cleaning: {str(e)}")
\ No newline at end of file
+            logger.error(f"Task failed while cleaning: {str(e)}")
+
+@celery_app.task(
+                 bind=True, name="tasks.maintenance.evict_embedding_cache",
+                 autoretry_for=(Exception,),
+                 retry_kwargs={'max_retries': 3, 'countdown': 60}
+                )
+def evict_embedding_cache(self):
+
+    return run_in_worker_loop(
+        _evict_embedding_cache(self)
+    )
+
+async def _evict_embedding_cache(task_instance):
+
+    db_engine, vectordb_client = None, None
+
+    try:
+
+        (db_engine, db_client, llm_provider_factory,
+        vectordb_provider_factory,
+        generation_client, embedding_client,
+        vectordb_client, template_parser,
+        _vision_client) = await get_worker_setup_utils()
+
+        settings = get_config()
+        embedding_cache = await EmbeddingCacheModel.create_instance(db_client=db_client)
+
+        expired = await embedding_cache.evict_unused_entries(
+            max_age_seconds=settings.EMBEDDING_CACHE_MAX_AGE_DAYS * 86400
+        )
+        overflow = await embedding_cache.evict_to_max_entries(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES
+        )
+
+        logger.info(f"Embedding cache eviction: {expired} expired, {overflow} over capacity")
+
+        return {"expired": expired, "overflow": overflow}
+
+    except Exception as e:
+        logger.error(f"Task failed: {str(e)}")
+        raise
+    finally:
+        try:
+            await release_setup_utils(db_engine, vectordb_client)
+        except Exception as e:
+            logger.error(f"Task failed while cleaning: {str(e)}")
@@ -1,12 +1,18 @@
-from celery import chain
-from celery_app import celery_app, get_setup_utils
+from celery import chain, chord
+from celery_app import celery_app, get_worker_setup_utils, release_setup_utils, run_in_worker_loop
 from helpers.config import get_config
-import asyncio
-from tasks.file_processing import process_project_files
+from tasks.file_processing import process_project_file, get_project_files
 from tasks.data_indexing import index_data_content 
 from models.ChunkModel import ChunkModel 
+from models.ProjectModel import ProjectModel
+from models.AssetModel import AssetModel
+from models.enums.ResponseSignal import responsesignal
+from controllers import NLPController
+from stores.vectordb import RetrievalCache
+from utils.ingestion_profiler import IngestionProfiler
 
 import logging
+import uuid
 logger = logging.getLogger(__name__)
 
 @celery_app.task(
@@ -25,23 +31,22 @@ def push_after_process_task(self, prev_task_result):
          vectordb_client = None
          try:
              (db_engine, db_client, _, _,
-              _, _, vectordb_client, _, _) = await get_setup_utils()
+              _, _, vectordb_client, _, _) = await get_worker_setup_utils()
 
              chunk_model = await ChunkModel.create_instance(db_client=db_client)
              count = await chunk_model.get_total_chunks_count(project_id=db_id)
-             return count
+             version = await chunk_model.get_chunks_state_version(project_id=db_id)
+             return count, version
          finally:
-             if db_engine:
-                 await db_engine.dispose()
-             if vectordb_client:
-                 await vectordb_client.disconnect()
+             await release_setup_utils(db_engine, vectordb_client)
 
-    total_chunks_count = asyncio.run(get_total_count())
+    total_chunks_count, chunks_state_version = run_in_worker_loop(get_total_count())
 
     result = index_data_content.delay(
         project_id=db_id, 
         do_reset=do_reset,
-        total_chunks_count=total_chunks_count 
+        total_chunks_count=total_chunks_count,
+        chunks_state_version=chunks_state_version
     )
 
     return {
@@ -51,6 +56,79 @@ def push_after_process_task(self, prev_task_result):
         "status": "Indexing Triggered"
     }
 
+@celery_app.task(
+    bind=True, name="tasks.process_workflow.collect_project_files_results",
+)
+def collect_project_files_results(self, file_results, project_id: int,
+                                  user_project_id: int, do_reset: int):
+    """Chord callback: aggregate per-file results into the process_project_files shape."""
+    failed_assets = [r["asset_id"] for r in file_results if r.get("status") == "failed"]
+    if failed_assets:
+        logger.error(f"Files failed | project: {project_id} | assets: {failed_assets}")
+
+    return {
+        "signal": responsesignal.PROCESSING_SUCCESS.value,
+        "inserted_chunks": sum(r.get("inserted_chunks", 0) for r in file_results),
+        "processed_files": sum(1 for r in file_results if r.get("status") == "processed"),
+        "skipped_files": sum(1 for r in file_results if r.get("status") == "unchanged"),
+        "failed_files": failed_assets,
+        "project_id": user_project_id,
+        "do_reset": do_reset,
+        "_db_id": project_id,
+        "profile": IngestionProfiler.combine_summaries([r.get("profile") for r in file_results]),
+    }
+
+async def _prepare_project_files(project_id: int, file_id: int, do_reset: int):
+    """
+    Resolve the assets to process and apply do_reset once, before fan-out.
+    Returns ``(user_project_id, asset_ids, reset_token)``; the token is
+    fresh for every reset (None without one) and keys the per-file tasks,
+    so none of them skips its work as already done for the wiped data.
+    """
+    db_engine, vectordb_client = None, None
+    retrieval_cache = None
+    reset_token = None
+    try:
+        (db_engine, db_client, _, _,
+         generation_client, embedding_client,
+         vectordb_client, template_parser, _) = await get_worker_setup_utils()
+
+        project_model = await ProjectModel.create_instance(db_client=db_client)
+        project = await project_model.get_project_by_id(project_id=project_id)
+        if not project:
+            raise Exception(f"No project found for project_id: {project_id}")
+
+        asset_model = await AssetModel.create_instance(db_client=db_client)
+        project_files_ids = await get_project_files(asset_model, project, file_id)
+
+        if not project_files_ids:
+            raise Exception(f"No files found for project_id: {project_id}")
+
+        if do_reset == 1:
+            retrieval_cache = RetrievalCache.from_config(get_config())
+            nlp_controller = NLPController(
+                vectordb_client=vectordb_client,
+                generation_client=generation_client,
+                template_parser=template_parser,
+                embedding_client=embedding_client,
+                retrieval_cache=retrieval_cache,
+            )
+
+            # delete associated vectors collection (and invalidate cached searches)
+            _ = await nlp_controller.reset_vector_db_collection(project=project)
+
+            # delete associated chunks
+            chunk_model = await ChunkModel.create_instance(db_client=db_client)
+            _ = await chunk_model.delete_chunks_by_db_project_id(db_project_id=project.id)
+
+            reset_token = uuid.uuid4().hex
+
+        return project.project_id, list(project_files_ids.keys()), reset_token
+    finally:
+        if retrieval_cache is not None:
+            await retrieval_cache.close()
+        await release_setup_utils(db_engine, vectordb_client)
+
 @celery_app.task(
     bind=True, name="tasks.process_workflow.process_and_push_workflow",
     autoretry_for=(Exception,),
@@ -61,9 +139,23 @@ def process_and_push_workflow(self, project_id: int,
                               overlap_size: int, do_reset: int,
                               files_state_version: int = 0):
 
-    workflow = chain(
-        process_project_files.s(project_id, file_id, chunk_size, overlap_size, do_reset,files_state_version),
-        push_after_process_task.s()
+    user_project_id, asset_ids, reset_token = run_in_worker_loop(
+        _prepare_project_files(project_id, file_id, do_reset)
+    )
+
+    # One subtask per asset; the callback sums their chunk counts and hands
+    # the project-level result to push_after_process_task to start indexing.
+    workflow = chord(
+        [
+            process_project_file.s(project_id, asset_id, chunk_size,
+                                   overlap_size, files_state_version, do_reset,
+                                   reset_token)
+            for asset_id in asset_ids
+        ],
+        chain(
+            collect_project_files_results.s(project_id, user_project_id, do_reset),
+            push_after_process_task.s()
+        )
     )
 
     result = workflow.apply_async()
@@ -71,6 +163,8 @@ def process_and_push_workflow(self, project_id: int,
     return {
         "signal": "WORKFLOW_STARTED",
         "workflow_id": result.id,
-        "tasks": ["tasks.file_processing.process_project_files", 
+        "files_count": len(asset_ids),
+        "tasks": ["tasks.file_processing.process_project_file", 
+                  "tasks.process_workflow.collect_project_files_results",
                   "tasks.process_workflow.push_after_process_task"]
-    }
\ No newline at end of file
+    }
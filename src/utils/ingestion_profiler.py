@@ -0,0 +1,208 @@
+"""
+Per-file, per-stage timings for document ingestion.
+
+A :class:`IngestionProfiler` lives on each ``processcontroller``. The
+loaders wrap their expensive steps in :meth:`IngestionProfiler.stage` and
+count what they extract with :meth:`IngestionProfiler.count`; the
+file-processing tasks wrap every asset in :meth:`IngestionProfiler.file`.
+When a file finishes its totals are exported as Prometheus histograms (see
+``utils.metrics``), and :meth:`IngestionProfiler.summary` is returned in the
+task result.
+
+Stages can nest (``chunking`` runs while ``load`` pulls from the loader) and
+``vision`` adds up calls made concurrently from several threads, so stage
+times are not additive and may exceed the file's wall time.
+"""
+
+import cProfile
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from utils.metrics import (INGESTION_ELEMENTS, INGESTION_FILE_BYTES,
+                           INGESTION_FILE_DURATION, INGESTION_STAGE_DURATION)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionProfiler:
+
+    # Per-file entries kept in a summary (slowest first).
+    SUMMARY_MAX_FILES = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: dict | None = None
+        self._files: list[dict] = []
+
+    @contextmanager
+    def file(self, file_name: str, file_path: str | None = None, export: bool = True):
+        """
+        Profile one file. Yields its record; set ``record["status"]`` to the
+        outcome (defaults to "processed", "failed" if the block raises).
+        With ``export`` off the record is neither exported nor summarized
+        (used by parsing shards that hand their stages back to the parent).
+        """
+        extension = os.path.splitext(file_name)[1].lower() or "none"
+        file_bytes = 0
+        if file_path and os.path.exists(file_path):
+            file_bytes = os.path.getsize(file_path)
+
+        record = {
+            "file": file_name,
+            "extension": extension,
+            "status": "processed",
+            "bytes": file_bytes,
+            "seconds": 0.0,
+            "stages": {},
+            "counts": {},
+        }
+        previous, self._current = self._current, record
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "failed"
+            raise
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self._current = previous
+            if export:
+                with self._lock:
+                    self._files.append(record)
+                self._export(record)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block as one call of stage ``name`` of the current file."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def timed_iter(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        Yield from ``iterable``, charging only the time spent producing each
+        item (not the consumer's time between items) to stage ``name``.
+        """
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            self.add_stage(name, elapsed)
+
+    def add_stage(self, name: str, seconds: float, calls: int = 1) -> None:
+        record = self._current
+        if record is None:
+            return
+        with self._lock:
+            stage = record["stages"].setdefault(name, {"seconds": 0.0, "calls": 0})
+            stage["seconds"] += seconds
+            stage["calls"] += calls
+
+    def count(self, kind: str, amount: int = 1) -> None:
+        """Add ``amount`` to the current file's ``kind`` counter (pages, images, bytes...)."""
+        record = self._current
+        if record is None or not amount:
+            return
+        with self._lock:
+            record["counts"][kind] = record["counts"].get(kind, 0) + amount
+
+    def merge(self, profile: dict | None) -> None:
+        """Fold the stages/counts of a shard's record into the current file."""
+        if not profile:
+            return
+        for name, stage in profile.get("stages", {}).items():
+            self.add_stage(name, stage["seconds"], stage["calls"])
+        for kind, amount in profile.get("counts", {}).items():
+            self.count(kind, amount)
+
+    def _export(self, record: dict) -> None:
+        extension = record["extension"]
+        try:
+            INGESTION_FILE_DURATION.labels(extension=extension,
+                                           status=record["status"]).observe(record["seconds"])
+            INGESTION_FILE_BYTES.labels(extension=extension).observe(record["bytes"])
+            for name, stage in record["stages"].items():
+                INGESTION_STAGE_DURATION.labels(stage=name,
+                                                extension=extension).observe(stage["seconds"])
+            for kind, amount in record["counts"].items():
+                INGESTION_ELEMENTS.labels(kind=kind, extension=extension).inc(amount)
+        except Exception as e:  # metrics must never fail ingestion
+            logger.debug(f"Failed to export ingestion metrics: {e}")
+
+    def summary(self) -> dict:
+        """JSON-friendly totals plus the slowest files, for task results."""
+        with self._lock:
+            files = [self._round_record(r) for r in self._files]
+        return self.combine_summaries([{"files": files}])
+
+    @classmethod
+    def combine_summaries(cls, summaries: list[dict | None]) -> dict:
+        """Merge summaries (e.g. of per-file chord tasks) into one."""
+        files = [f for s in summaries if s for f in s.get("files", [])]
+
+        stages: dict[str, float] = {}
+        for f in files:
+            for name, stage in f["stages"].items():
+                stages[name] = round(stages.get(name, 0.0) + stage["seconds"], 4)
+
+        files.sort(key=lambda f: f["seconds"], reverse=True)
+        return {
+            "file_count": len(files),
+            "seconds": round(sum(f["seconds"] for f in files), 4),
+            "bytes": sum(f["bytes"] for f in files),
+            "stages": stages,
+            "files": files[:cls.SUMMARY_MAX_FILES],
+        }
+
+    @staticmethod
+    def _round_record(record: dict) -> dict:
+        return {
+            **record,
+            "seconds": round(record["seconds"], 4),
+            "stages": {
+                name: {"seconds": round(stage["seconds"], 4), "calls": stage["calls"]}
+                for name, stage in record["stages"].items()
+            },
+            "counts": dict(record["counts"]),
+        }
+
+
+@contextmanager
+def cprofile_to_dir(directory: str | None, label: str):
+    """
+    Run the block under cProfile and dump ``<label>-<pid>-<time>.prof`` into
+    ``directory`` (inspect with ``python -m pstats`` or snakeviz). No-op
+    when ``directory`` is empty.
+    """
+    if not directory:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{label}-{os.getpid()}-{int(time.time())}.prof")
+            profiler.dump_stats(path)
+            logger.info(f"Task profile written to {path}")
+        except OSError as e:
+            logger.warning(f"Failed to write task profile for {label}: {e}")
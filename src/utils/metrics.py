@@ -1,13 +1,53 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess, start_http_server
 from fastapi import FastAPI, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from helpers.config import get_config
+import asyncio
+import os
 import time
 
 
 # Define metrics
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
+EVENT_LOOP_LAG = Gauge('event_loop_lag_seconds', 'Delay of a periodic event-loop tick past its schedule')
+QUERY_EMBEDDING_CACHE_LOOKUPS = Counter(
+    'query_embedding_cache_lookups_total', 'Query embedding cache lookups by outcome',
+    ['result']  # local_hit | redis_hit | miss
+)
+RETRIEVAL_CACHE_LOOKUPS = Counter(
+    'retrieval_cache_lookups_total', 'Versioned search-result cache lookups by outcome',
+    ['result']  # hit | miss
+)
+ANSWER_CACHE_LOOKUPS = Counter(
+    'answer_cache_lookups_total', 'Semantic answer cache lookups by outcome',
+    ['result']  # hit | miss
+)
+ANSWER_CACHE_SAVED_TOKENS = Counter(
+    'answer_cache_saved_tokens_total', 'Estimated generation tokens not spent thanks to answer cache hits',
+    ['kind']  # prompt | completion
+)
+
+# Ingestion metrics (recorded by the Celery workers, see utils.ingestion_profiler)
+_INGESTION_SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+INGESTION_FILE_DURATION = Histogram(
+    'ingestion_file_duration_seconds', 'Time to parse, chunk and store one file',
+    ['extension', 'status'], buckets=_INGESTION_SECONDS_BUCKETS
+)
+INGESTION_STAGE_DURATION = Histogram(
+    'ingestion_stage_duration_seconds', 'Time one file spent in an ingestion stage',
+    ['stage', 'extension'], buckets=_INGESTION_SECONDS_BUCKETS
+)
+INGESTION_FILE_BYTES = Histogram(
+    'ingestion_file_bytes', 'Size of ingested files in bytes',
+    ['extension'], buckets=(1e4, 1e5, 1e6, 1e7, 5e7, 1e8, 5e8, 1e9)
+)
+INGESTION_ELEMENTS = Counter(
+    'ingestion_elements_total', 'Elements (pages, tables, images, chunks, ...) extracted during ingestion',
+    ['kind', 'extension']
+)
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -35,4 +75,40 @@ def setup_metrics(app: FastAPI):
 
     @app.get("/k9L_mP2xQ5_8vNr1Z0_yTw3A", include_in_schema=False)
     def metrics():
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Sleep ``interval`` in a loop and record how late each wake-up is. Any
+    blocking call on the loop (e.g. a synchronous SDK request inside a
+    handler) shows up directly as lag.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.set(max(0.0, loop.time() - scheduled))
+
+
+def start_worker_metrics_server(port: int):
+    """
+    Serve /metrics for a Celery worker on ``port``.
+
+    Prefork children record the ingestion metrics, so with
+    ``PROMETHEUS_MULTIPROC_DIR`` set the parent process aggregates every
+    child's samples; without it only the serving process is visible (fine
+    for the solo/threads pools).
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    start_http_server(port, registry=registry)
+
+
+def mark_worker_process_dead(pid: int):
+    """Drop a finished prefork child's live gauges from the multiprocess store."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)